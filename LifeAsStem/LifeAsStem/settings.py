@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -47,7 +48,7 @@ MIDDLEWARE = [
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'stemlife.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -84,6 +85,97 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+#
+# STEMLIFE_CACHE picks the backend:
+#   locmem  per-process memory (default, fine for a single server process)
+#   file    files under STEMLIFE_CACHE_LOCATION, shared by processes on one host
+#   redis   any Redis-protocol server at STEMLIFE_CACHE_LOCATION; needs the
+#           django-redis package (Django 3.2 has no built-in Redis backend)
+#
+# Sessions, users and player ids are only cached when the backend is shared,
+# since a logout or password change in one process must reach the others
+
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'stemlife',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('STEMLIFE_CACHE_LOCATION', str(BASE_DIR / '.cache')),
+    },
+    'redis': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': os.environ.get('STEMLIFE_CACHE_LOCATION', 'redis://127.0.0.1:6379/1'),
+    },
+}
+
+STEMLIFE_CACHE = os.environ.get('STEMLIFE_CACHE', 'locmem')
+
+STEMLIFE_SHARED_CACHE = STEMLIFE_CACHE != 'locmem'
+
+CACHES = {
+    'default': {
+        **CACHE_BACKENDS[STEMLIFE_CACHE],
+        'KEY_PREFIX': 'stemlife',
+        'TIMEOUT': 300,
+    }
+}
+
+
+# Sessions
+# https://docs.djangoproject.com/en/5.0/topics/http/sessions/
+#
+# STEMLIFE_SESSIONS picks the engine: cached_db (the default with a shared
+# cache) reads sessions from the cache and only falls back to the database on
+# a miss, signed_cookies keeps them client-side with no server storage at
+# all, db (the default with locmem) is Django's default
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+SESSION_ENGINE = SESSION_ENGINES[
+    os.environ.get('STEMLIFE_SESSIONS', 'cached_db' if STEMLIFE_SHARED_CACHE else 'db')
+]
+
+
+# Logging
+# https://docs.djangoproject.com/en/5.0/topics/logging/
+#
+# The game logs its diagnostics (which events were eligible, which one was
+# picked, ...) as key=value pairs under the 'stemlife' logger at DEBUG level.
+# They are dropped unless STEMLIFE_LOG_LEVEL is lowered, e.g. to DEBUG.
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'stemlife': {
+            'format': '{asctime} {levelname} {name} {message}',
+            'style': '{',
+        },
+    },
+    'handlers': {
+        'stemlife': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'stemlife',
+        },
+    },
+    'loggers': {
+        'stemlife': {
+            'handlers': ['stemlife'],
+            'level': os.environ.get('STEMLIFE_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -1,8 +1,17 @@
 from django.contrib import admin
-from .models import User, Player, LifeEvent, PlayerProgress, Questions
+from .models import User, Player, LifeEvent, EventChoice, PlayerProgress, EventCompletion, Questions
+
+class EventChoiceInline(admin.TabularInline):
+    model = EventChoice
+    extra = 0
+
+class LifeEventAdmin(admin.ModelAdmin):
+    inlines = [EventChoiceInline]
+    prepopulated_fields = {'key': ('stage', 'title')}
 
 admin.site.register(User)
 admin.site.register(Player)
-admin.site.register(LifeEvent)
+admin.site.register(LifeEvent, LifeEventAdmin)
 admin.site.register(PlayerProgress)
+admin.site.register(EventCompletion)
 admin.site.register(Questions)
\ No newline at end of file
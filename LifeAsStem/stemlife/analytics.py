@@ -0,0 +1,202 @@
+"""Aggregate outcomes across all players, materialized in CohortSummary.
+
+``refresh()`` computes every section with database aggregates, never by
+loading players into Python, and stores one CohortSummary row per section:
+
+- ``stage:<stage>``: how many players are in the stage, how many of them are
+  recommended each STEM field, and percentiles of every stat
+- ``events``: how many players completed each event, and how often
+- ``choices``: how often each choice of each event was made
+
+Each section is fingerprinted with one cheap aggregate over its source rows.
+For a stage that is its player count and the sums of ``state_version`` and
+``age_months``, which every choice, reset or stage change moves. Only the
+sections whose fingerprint moved are recomputed, so a refresh after a few
+turns re-aggregates just the stages those players are in. Choice counts are
+kept up to date from the choice log: a refresh only counts the ChoiceEvents
+added since the previous one, without touching Player rows.
+
+``summary()`` reads the whole table back in one query for the dashboard.
+"""
+import hashlib
+import json
+import math
+
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+
+from .models import ArchivedChoiceEvent, ChoiceEvent, CohortSummary, EventCompletion, LifeEvent, Player
+from .recommendation import FIELDS, STAT_FIELDS, field_expression
+from .stages import STAGES
+
+EVENTS_KEY = 'events'
+CHOICES_KEY = 'choices'
+
+# Stat percentiles reported for every stage
+PERCENTILES = [10, 25, 50, 75, 90]
+
+
+def stage_key(stage):
+    return f'stage:{stage}'
+
+
+def _fingerprint(values):
+    return hashlib.sha256(json.dumps(values, default=str).encode()).hexdigest()
+
+
+def percentiles(histogram):
+    """Nearest-rank PERCENTILES of a ``{value: count}`` histogram"""
+    total = sum(histogram.values())
+    result = {}
+    if not total:
+        return {str(p): None for p in PERCENTILES}
+    ranked = sorted(histogram.items())
+    for p in PERCENTILES:
+        rank = max(1, math.ceil(p * total / 100))
+        seen = 0
+        for value, count in ranked:
+            seen += count
+            if seen >= rank:
+                result[str(p)] = value
+                break
+    return result
+
+
+def _fingerprints():
+    """Map section key -> fingerprint of the rows it is computed from"""
+    fingerprints = {stage_key(stage): _fingerprint([0, 0, 0]) for stage in STAGES}
+    stages = Player.objects.values('current_stage').annotate(
+        players=Count('id'), versions=Sum('state_version'), months=Sum('age_months'),
+    )
+    for row in stages:
+        key = stage_key(row['current_stage'])
+        if key in fingerprints:
+            fingerprints[key] = _fingerprint([row['players'], row['versions'], row['months']])
+    completions = EventCompletion.objects.aggregate(rows=Count('id'), completions=Sum('count'))
+    fingerprints[EVENTS_KEY] = _fingerprint([completions['rows'], completions['completions']])
+    # The log is append-only, so its last id tells whether anything was added
+    fingerprints[CHOICES_KEY] = str(ChoiceEvent.objects.aggregate(last=Max('id'))['last'] or 0)
+    return fingerprints
+
+
+def _stage_sections(stages):
+    """Data of the given stages' sections, one GROUP BY query per stat"""
+    players = Player.objects.filter(current_stage__in=stages)
+    data = {
+        stage: {'players': 0, 'recommendations': dict.fromkeys(FIELDS, 0), 'stats': {}}
+        for stage in stages
+    }
+
+    recommended = (
+        players.annotate(field=field_expression())
+        .values('current_stage', 'field').annotate(players=Count('id'))
+    )
+    for row in recommended:
+        section = data[row['current_stage']]
+        section['recommendations'][row['field']] = row['players']
+        section['players'] += row['players']
+
+    # Stats are small bounded integers, so a per-value histogram is a short
+    # result and gives exact percentiles
+    for stat in STAT_FIELDS:
+        histograms = {stage: {} for stage in stages}
+        for row in players.values('current_stage', stat).annotate(players=Count('id')):
+            histograms[row['current_stage']][row[stat]] = row['players']
+        for stage, histogram in histograms.items():
+            data[stage]['stats'][stat] = percentiles(histogram)
+    return data
+
+
+def _events_section():
+    completions = (
+        EventCompletion.objects.values('event__key')
+        .annotate(players=Count('progress'), completions=Sum('count'))
+        .order_by('-completions', 'event__key')
+    )
+    return {
+        'events': [
+            {'key': row['event__key'], 'players': row['players'], 'completions': row['completions']}
+            for row in completions
+        ],
+    }
+
+
+def _choices_section(previous):
+    """Choice counts per event, adding the log entries after ``previous``'s.
+
+    ``previous`` is the section's last data, or None to count the whole log,
+    archive included. An entry committed after a refresh that already saw a
+    higher id is only counted by a full refresh.
+    """
+    data = previous or {'last_id': 0, 'events': {}}
+    logs = [ChoiceEvent.objects.filter(id__gt=data['last_id'])]
+    if previous is None:
+        logs.append(ArchivedChoiceEvent.objects.all())
+
+    for log in logs:
+        # Count up to the last id seen, so entries added meanwhile are left
+        # for the next refresh rather than counted twice
+        last_id = log.aggregate(last=Max('id'))['last'] or 0
+        data['last_id'] = max(data['last_id'], last_id)
+        # Resets have no event and count as no choice
+        counts = (
+            log.filter(id__lte=last_id, event__isnull=False)
+            .values('event_id', 'choice_index').annotate(times=Count('id'))
+        )
+        for row in counts:
+            event = data['events'].setdefault(str(row['event_id']), {'key': None, 'choices': {}})
+            choice = str(row['choice_index'])
+            event['choices'][choice] = event['choices'].get(choice, 0) + row['times']
+
+    unnamed = [int(event_id) for event_id, event in data['events'].items() if event['key'] is None]
+    for event_id, key in LifeEvent.objects.filter(id__in=unnamed).values_list('id', 'key'):
+        data['events'][str(event_id)]['key'] = key
+    return data
+
+
+def refresh(full=False):
+    """Recompute the sections whose data changed, or all of them; returns their keys"""
+    # Fingerprints are taken before the data, so anything written meanwhile
+    # leaves the stored fingerprint stale and is picked up next time
+    fingerprints = _fingerprints()
+    stored = dict(CohortSummary.objects.values_list('key', 'fingerprint'))
+    changed = [key for key, fingerprint in fingerprints.items() if full or stored.get(key) != fingerprint]
+
+    sections = {}
+    stages = [stage for stage in STAGES if stage_key(stage) in changed]
+    if stages:
+        sections.update({stage_key(stage): data for stage, data in _stage_sections(stages).items()})
+    if EVENTS_KEY in changed:
+        sections[EVENTS_KEY] = _events_section()
+    if CHOICES_KEY in changed:
+        previous = None
+        if not full:
+            previous = CohortSummary.objects.filter(key=CHOICES_KEY).values_list('data', flat=True).first()
+        sections[CHOICES_KEY] = _choices_section(previous)
+
+    now = timezone.now()
+    with transaction.atomic():
+        for key, data in sections.items():
+            CohortSummary.objects.update_or_create(
+                key=key, defaults={'fingerprint': fingerprints[key], 'data': data, 'refreshed_at': now},
+            )
+    return changed
+
+
+def summary():
+    """Every materialized section, as served by the analytics endpoint"""
+    rows = {row.key: row for row in CohortSummary.objects.all()}
+    stages = [
+        {'stage': stage, **rows[stage_key(stage)].data}
+        for stage in STAGES if stage_key(stage) in rows
+    ]
+    events = rows.get(EVENTS_KEY)
+    choices = rows[CHOICES_KEY].data['events'].values() if CHOICES_KEY in rows else []
+    return {
+        'stages': stages,
+        'events': events.data['events'] if events else [],
+        # Times each choice index of each event was made
+        'choices': sorted(choices, key=lambda event: event['key'] or ''),
+        'refreshed_at': max((row.refreshed_at for row in rows.values()), default=None),
+    }
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class StemlifeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'stemlife'
+
+    def ready(self):
+        # Register the signal handlers that keep the event catalog and the
+        # view caches fresh
+        from . import cache, catalog  # noqa: F401
@@ -0,0 +1,168 @@
+"""Cache keys, timeouts and invalidation hooks for the stemlife views.
+
+Everything goes through Django's default cache (see CACHES in settings), so
+the same code works with the local-memory, file and Redis backends. The
+default backend is private to each process, so nothing here relies on a
+deletion reaching other processes. Shared data is versioned in the database
+instead: the event catalog and the question bank by a ChangeStamp row, each
+player's entries by their ``state_version``, which every choice and reset
+bumps. Session hashes and player ids cannot be versioned that way, so they
+are only cached when the backend is shared. Entries are still dropped when
+the data behind them changes; the timeouts only bound how long unused
+entries are kept.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import ChangeStamp, EventCompletion, Player, PlayerProgress, Questions, User
+
+# ChangeStamp bumped whenever the event catalog changes, so every process
+# notices invalidations made by the others
+CATALOG_STAMP = 'catalog'
+
+# ChangeStamp of the question bank. /question/ pages are cached under its
+# version, so a change simply moves readers on to new keys, and the time of
+# its last bump is their Last-Modified
+QUESTIONS_STAMP = 'questions'
+QUESTIONS_TIMEOUT = 60 * 60 * 24
+
+# Per-player entries, stored with the state_version they were computed at
+COMPLETIONS_TIMEOUT = 60 * 60
+RECOMMENDATION_TIMEOUT = 60 * 60
+
+# Session hashes of authenticated users and the player each of them plays,
+# only cached when the backend is shared (see STEMLIFE_SHARED_CACHE)
+USER_TIMEOUT = 60 * 15
+PLAYER_TIMEOUT = 60 * 60
+
+
+def questions_key(version, query):
+    digest = hashlib.md5(query.encode()).hexdigest()
+    return f'questions:{version}:{digest}'
+
+
+def completions_key(progress_id):
+    return f'completions:{progress_id}'
+
+
+def recommendation_key(player_id):
+    return f'recommendation:{player_id}'
+
+
+def user_key(user_id):
+    return f'user:{user_id}'
+
+
+def player_key(user_id):
+    return f'player:{user_id}'
+
+
+def player_id_for(user):
+    """Id of the user's player, without touching the database on a cache hit.
+
+    Raises Player.DoesNotExist like ``Player.objects.get(users=user)``.
+    """
+    if not settings.STEMLIFE_SHARED_CACHE:
+        # Removing the user from the player elsewhere could not drop the entry
+        return Player.objects.values_list('id', flat=True).get(users=user)
+    key = player_key(user.pk)
+    player_id = cache.get(key)
+    if player_id is None:
+        player_id = Player.objects.values_list('id', flat=True).get(users=user)
+        cache.set(key, player_id, PLAYER_TIMEOUT)
+    return player_id
+
+
+def forget_player_id(user):
+    cache.delete(player_key(user.pk))
+
+
+def get_versioned(key, version):
+    """The value cached under ``key`` for this version of the data, or None"""
+    entry = cache.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    return None
+
+
+def set_versioned(key, version, value, timeout):
+    cache.set(key, (version, value), timeout)
+
+
+def invalidate_player(player_id, progress_id=None):
+    """Forget everything cached for a player once the current transaction commits"""
+    keys = [recommendation_key(player_id)]
+    if progress_id is not None:
+        keys.append(completions_key(progress_id))
+    # Deleting before commit would let a concurrent read cache the old rows
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def questions_stamp():
+    """The question bank's ChangeStamp, created on first use"""
+    stamp, _ = ChangeStamp.objects.get_or_create(key=QUESTIONS_STAMP)
+    return stamp
+
+
+def catalog_version():
+    """The catalog's ChangeStamp version, 0 until the catalog first changes"""
+    return ChangeStamp.objects.filter(key=CATALOG_STAMP).values_list('version', flat=True).first() or 0
+
+
+def bump_catalog_version():
+    """Bump the catalog's ChangeStamp; returns the version it is now at"""
+    ChangeStamp.bump(CATALOG_STAMP)
+    return catalog_version()
+
+
+@receiver(post_save, sender=Questions)
+@receiver(post_delete, sender=Questions)
+def _questions_changed(sender, **kwargs):
+    # Stamped after commit so a concurrent read cannot cache the old rows
+    # under the new stamp
+    transaction.on_commit(lambda: ChangeStamp.bump(QUESTIONS_STAMP))
+
+
+@receiver(post_save, sender=EventCompletion)
+@receiver(post_delete, sender=EventCompletion)
+def _completion_changed(sender, instance, **kwargs):
+    cache.delete(completions_key(instance.progress_id))
+
+
+@receiver(m2m_changed, sender=PlayerProgress.completed_events.through)
+def _completed_events_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        cache.delete(completions_key(instance.pk))
+    elif pk_set:
+        cache.delete_many([completions_key(pk) for pk in pk_set])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def _user_changed(sender, instance, **kwargs):
+    cache.delete(user_key(instance.pk))
+
+
+@receiver(m2m_changed, sender=Player.users.through)
+def _player_users_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        if action.startswith('post_'):
+            cache.delete(player_key(instance.pk))
+    elif action == 'pre_clear':
+        # post_clear does not say which users were removed
+        cache.delete_many([player_key(pk) for pk in instance.users.values_list('pk', flat=True)])
+    elif action.startswith('post_') and pk_set:
+        cache.delete_many([player_key(pk) for pk in pk_set])
+
+
+@receiver(pre_delete, sender=Player)
+def _player_deleted(sender, instance, **kwargs):
+    user_ids = instance.users.values_list('pk', flat=True)
+    cache.delete_many([player_key(pk) for pk in user_ids])
@@ -0,0 +1,206 @@
+"""Process-wide, read-only index of the LifeEvent catalog.
+
+The catalog written by ``populate_events`` almost never changes, so instead of
+querying ``LifeEvent`` on every request we load it once per process and keep it
+bucketed by stage and indexed by age, with each event's choices prefetched.
+Any save or delete of a ``LifeEvent`` or ``EventChoice`` bumps a version
+stamp once its transaction commits, and the next lookup rebuilds the index.
+The stamp is also kept in the database, as the catalog's ChangeStamp, which
+every process checks every VERSION_CHECK_INTERVAL seconds, so changes made
+elsewhere (another worker, ``populate_events``) are picked up too. Bulk
+writes skip signals, so code using them calls ``invalidate_catalog()``
+itself, also on commit.
+
+Each event in a snapshot owns one bit, so sets of events are plain integers:
+the events open at a (stage, age), the events of a frequency and the events a
+player has exhausted. Eligibility is then a couple of AND operations. Bit
+positions are only meaningful within the snapshot that assigned them.
+"""
+import bisect
+import json
+import random
+import threading
+import time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache
+from .models import EventChoice, LifeEvent
+from .stages import stage_ages
+
+# Seconds between checks of the shared version stamp for changes made by
+# other processes; changes made in this process are seen immediately
+VERSION_CHECK_INTERVAL = 5
+
+_lock = threading.Lock()
+_version = 0
+_catalog = None
+_shared_version = None
+_checked_at = None
+
+
+def iter_bits(mask):
+    """Yield the positions of the set bits in ``mask``, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class EventCatalog:
+    """Immutable snapshot of every LifeEvent, indexed by stage and age"""
+
+    def __init__(self, events, version):
+        self.version = version
+        self.events = {}
+        # Bit position -> event, and event id -> bit
+        self._by_bit = []
+        self._bits = {}
+        # stage -> {age: bitmap of events open at that age}
+        self._by_age = {}
+        # frequency -> bitmap of events with that frequency
+        self._by_frequency = {}
+        # event id -> JSON-encoded event payload, filled on first use
+        self._payloads = {}
+
+        for event in events:
+            bit = 1 << len(self._by_bit)
+            self.events[event.id] = event
+            self._bits[event.id] = bit
+            self._by_bit.append(event)
+
+            # Only the ages within the event's stage can ever be asked for
+            first, last = stage_ages(event.stage)
+            last = event.max_age if last is None else min(last, event.max_age)
+            ages = self._by_age.setdefault(event.stage, {})
+            for age in range(max(first, event.min_age), last + 1):
+                ages[age] = ages.get(age, 0) | bit
+            self._by_frequency[event.frequency] = self._by_frequency.get(event.frequency, 0) | bit
+
+        # Every age at which at least one event is open, for jumping over gaps
+        self.ages = sorted({age for ages in self._by_age.values() for age in ages})
+
+    def __len__(self):
+        return len(self.events)
+
+    def get(self, event_id):
+        return self.events.get(event_id)
+
+    def payload(self, event):
+        """The event as served to clients, already encoded as JSON bytes.
+
+        Encoded once per event and snapshot, so a catalog change (which
+        replaces the snapshot) is the only thing that re-encodes it.
+        """
+        payload = self._payloads.get(event.id)
+        if payload is None:
+            payload = json.dumps({
+                "id": event.id,
+                "title": event.title,
+                "description": event.description,
+                "choices": event.get_choices(),
+                "category": event.category
+            }, cls=DjangoJSONEncoder).encode()
+            self._payloads[event.id] = payload
+        return payload
+
+    def mask_for(self, stage, age):
+        """Bitmap of the events of ``stage`` whose age interval contains ``age``"""
+        return self._by_age.get(stage, {}).get(age, 0)
+
+    def frequency_mask(self, *frequencies):
+        """Bitmap of the events with any of the given frequencies"""
+        mask = 0
+        for frequency in frequencies:
+            mask |= self._by_frequency.get(frequency, 0)
+        return mask
+
+    def exhausted_mask(self, counts):
+        """Bitmap of events completed as often as their frequency allows.
+
+        ``counts`` maps event id -> completions, as returned by
+        ``game.completion_counts``.
+        """
+        mask = 0
+        for event_id, count in counts.items():
+            event = self.events.get(event_id)
+            if event is None:
+                continue
+            limit = LifeEvent.FREQUENCY_LIMITS.get(event.frequency)
+            if limit is not None and count >= limit:
+                mask |= self._bits[event_id]
+        return mask
+
+    def events_in(self, mask):
+        """The events whose bits are set in ``mask``"""
+        return [self._by_bit[bit] for bit in iter_bits(mask)]
+
+    def random_event(self, mask):
+        """A uniformly random event out of ``mask``, or None if it is empty"""
+        if not mask:
+            return None
+        return self._by_bit[random.choice(list(iter_bits(mask)))]
+
+    def events_for(self, stage, age):
+        """Events of the given stage whose age interval contains ``age``"""
+        return self.events_in(self.mask_for(stage, age))
+
+    def next_age(self, age):
+        """The first age after ``age`` that any event covers, or None"""
+        index = bisect.bisect_right(self.ages, age)
+        if index < len(self.ages):
+            return self.ages[index]
+        return None
+
+
+def _check_shared_version():
+    """Go stale if another process changed the catalog since the last check"""
+    global _version, _shared_version, _checked_at
+    now = time.monotonic()
+    if _checked_at is not None and now - _checked_at < VERSION_CHECK_INTERVAL:
+        return
+    _checked_at = now
+    shared = cache.catalog_version()
+    with _lock:
+        if shared != _shared_version:
+            _shared_version = shared
+            _version += 1
+
+
+def get_catalog():
+    """Return the current catalog, (re)loading it if the version moved on"""
+    global _catalog
+    _check_shared_version()
+    catalog = _catalog
+    if catalog is None or catalog.version != _version:
+        with _lock:
+            if _catalog is None or _catalog.version != _version:
+                # Capture the version before loading so that a change landing
+                # mid-load leaves this snapshot stale rather than current.
+                version = _version
+                events = LifeEvent.objects.order_by('id').prefetch_related('choices')
+                _catalog = EventCatalog(events, version)
+            catalog = _catalog
+    return catalog
+
+
+def invalidate_catalog():
+    """Mark the loaded catalog as stale; the next lookup reloads it"""
+    global _version, _shared_version
+    shared = cache.bump_catalog_version()
+    with _lock:
+        _version += 1
+        _shared_version = shared
+
+
+@receiver(post_save, sender=LifeEvent)
+@receiver(post_delete, sender=LifeEvent)
+@receiver(post_save, sender=EventChoice)
+@receiver(post_delete, sender=EventChoice)
+def _life_event_changed(sender, **kwargs):
+    # Bumped after commit: a lookup made in between would otherwise reload
+    # the old rows and keep them under the new version
+    transaction.on_commit(invalidate_catalog)
@@ -0,0 +1,48 @@
+from functools import wraps
+
+from django.http import JsonResponse
+
+from . import cache
+from .models import Player, PlayerProgress
+
+
+def load_player(request, create_progress=False):
+    """Attach the user's player and progress to the request.
+
+    Both are fetched with a single select_related query, keyed by the cached
+    user -> player id mapping, and only once per request. Returns True if
+    the user has a player; otherwise ``request.player`` and
+    ``request.progress`` are None. Page views pass ``create_progress`` so a
+    player whose progress row is missing gets one instead of looking like
+    the user has no player.
+    """
+    if not hasattr(request, 'progress'):
+        request.player = request.progress = None
+        try:
+            try:
+                progress = PlayerProgress.objects.select_related('player').get(
+                    player_id=cache.player_id_for(request.user)
+                )
+            except PlayerProgress.DoesNotExist:
+                # The cached player id may be stale, look it up afresh next time
+                cache.forget_player_id(request.user)
+                if not create_progress:
+                    raise
+                player = Player.objects.get(users=request.user)
+                progress, _ = PlayerProgress.objects.get_or_create(player=player)
+        except (Player.DoesNotExist, PlayerProgress.DoesNotExist):
+            pass
+        else:
+            request.progress = progress
+            request.player = progress.player
+    return request.progress is not None
+
+
+def player_required(view_func):
+    """Run the view with request.player and request.progress loaded"""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not load_player(request):
+            return JsonResponse({"error": "Player not found"}, status=404)
+        return view_func(request, *args, **kwargs)
+    return wrapper
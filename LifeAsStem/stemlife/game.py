@@ -0,0 +1,239 @@
+"""Event selection and choice rules shared by the game views"""
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import cache
+from .models import MONTHS_PER_YEAR, ChoiceEvent, EventCompletion, Player, PlayerProgress
+from .stages import stage_for_age
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on the ages visited while looking for the next event
+MAX_AGING_STEPS = 100
+
+# Most choices a single play-turns/ request may submit
+MAX_BATCH_TURNS = 50
+
+# Player column each choice effect is added to
+EFFECT_FIELDS = {
+    'science': 'science_interest',
+    'technology': 'technology_interest',
+    'engineering': 'engineering_interest',
+    'math': 'math_interest',
+    'health': 'health',
+    'intelligence': 'intelligence',
+    'creativity': 'creativity',
+    'logic': 'logic',
+    'social': 'social_skills',
+}
+
+# Stats are clamped to this range after every choice
+STAT_MIN = 0
+STAT_MAX = 100
+
+# Always age a little bit (0.5 years) even if a choice has no increment
+DEFAULT_AGE_INCREMENT = 0.5
+
+
+class TurnError(Exception):
+    """A choice that cannot be played; the message is shown to the client"""
+
+
+def completion_counts(player, progress):
+    """Map event id -> times the player completed it.
+
+    Served from the cache when it was stored at the player's current
+    ``state_version``, otherwise one indexed lookup.
+    """
+    key = cache.completions_key(progress.id)
+    counts = cache.get_versioned(key, player.state_version)
+    if counts is None:
+        counts = dict(
+            EventCompletion.objects
+            .filter(progress=progress)
+            .values_list('event_id', 'count')
+        )
+        cache.set_versioned(key, player.state_version, counts, cache.COMPLETIONS_TIMEOUT)
+    return counts
+
+
+def pick_event(catalog, eligible):
+    """Pick a random event from a bitmap, preferring 'once' events"""
+    once_events = eligible & catalog.frequency_mask('once')
+    if once_events:
+        return catalog.random_event(once_events)
+
+    # 'rare' events are never picked, only counted towards eligibility
+    return catalog.random_event(eligible & catalog.frequency_mask('multiple', 'common'))
+
+
+def next_eligible_age(catalog, age, counts):
+    """Find the first age from ``age`` on that has eligible events.
+
+    Ages no event covers are skipped using the catalog's age index, and at
+    most MAX_AGING_STEPS ages are tried. Returns ``(age, stage, eligible)``
+    where ``eligible`` is a bitmap over ``catalog``, or None when the player
+    has run out of events.
+    """
+    exhausted = catalog.exhausted_mask(counts)
+    for _ in range(MAX_AGING_STEPS):
+        stage = stage_for_age(age)
+        eligible = catalog.mask_for(stage, age) & ~exhausted
+        if eligible:
+            return age, stage, eligible
+
+        age = catalog.next_age(age)
+        if age is None:
+            break
+    return None
+
+
+def age_increment(effects):
+    """Months a choice ages the player by; its effects give it in years"""
+    increment = effects.get('age_increment', 0)
+    if increment <= 0:
+        increment = DEFAULT_AGE_INCREMENT
+    return round(increment * MONTHS_PER_YEAR)
+
+
+def apply_choice(player, effects):
+    """Apply a choice's effects to the player with one UPDATE.
+
+    The player's row is read and locked first, so the clamped new values
+    are worked out from what is stored, even if ``player`` lagged behind,
+    and set on ``player`` without reloading it. Only the columns the choice
+    changes are written, and ``state_version`` is always bumped. Returns
+    the change actually made to each stat that moved. Must run inside a
+    transaction.
+    """
+    fields = {effect: field for effect, field in EFFECT_FIELDS.items() if effects.get(effect, 0)}
+    before = Player.objects.select_for_update().values(
+        'state_version', 'age_months', *fields.values()
+    ).get(pk=player.pk)
+
+    # The row stays locked until commit, so these are the values it ends with
+    updates = {
+        'state_version': before['state_version'] + 1,
+        'age_months': before['age_months'] + age_increment(effects),
+    }
+    deltas = {}
+    for effect, field in fields.items():
+        updates[field] = min(STAT_MAX, max(STAT_MIN, before[field] + effects[effect]))
+        if updates[field] != before[field]:
+            deltas[field] = updates[field] - before[field]
+
+    Player.objects.filter(pk=player.pk).update(**updates)
+    for field, value in updates.items():
+        setattr(player, field, value)
+    return deltas
+
+
+def current_event(player, progress, catalog, counts=None):
+    """The player's pending event, selecting a new one if there is none.
+
+    ``counts`` are the player's completion counts, looked up only when a
+    new event is needed if not given. A new event may age the player; only
+    the fields that moved are saved.
+    The event is stored on ``progress`` with a conditional UPDATE, so when
+    two requests race they both end up with the one stored first. Returns
+    None when the player has run out of events.
+    """
+    # Keep serving the pending event until a choice is made for it
+    event = catalog.get(progress.current_event_id) if progress.current_event_id else None
+    if event is not None:
+        return event
+
+    # Age the player up to the first age with events they can still take
+    if counts is None:
+        counts = completion_counts(player, progress)
+    found = next_eligible_age(catalog, player.age, counts)
+    if found is None:
+        logger.debug('no_events player=%s age=%s', player.id, player.age)
+        return None
+
+    age, stage, eligible = found
+    event = pick_event(catalog, eligible)
+    if event is None:
+        return None
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            'event_selected player=%s age=%s stage=%s eligible=%s event=%s',
+            player.id, age, stage, bin(eligible).count('1'), event.id,
+        )
+
+    # Write only what moved: the stage is derived from the age, so both
+    # only change when the player skipped ahead to older events, landing at
+    # the start of the year those events open at
+    changed = []
+    if age != player.age:
+        player.age_months = age * MONTHS_PER_YEAR
+        changed.append('age_months')
+    if stage != player.current_stage:
+        player.current_stage = stage
+        changed.append('current_stage')
+    with transaction.atomic():
+        if changed:
+            player.save(update_fields=changed)
+
+        # Only claim the slot if no other request filled it meanwhile
+        claimed = PlayerProgress.objects.filter(
+            pk=progress.pk, current_event=None
+        ).update(current_event=event, updated_at=timezone.now())
+    if not claimed:
+        progress.refresh_from_db(fields=['current_event'])
+        return catalog.get(progress.current_event_id) or progress.current_event
+    progress.current_event = event
+    return event
+
+
+def play_choice(player, progress, event, choice_index, counts=None, log=None):
+    """Apply the player's choice for their pending ``event``.
+
+    The event is claimed first so a double-click or a second tab cannot
+    apply the same choice twice, then the effects are applied and the
+    completion recorded; ``counts`` is kept in step when given. The choice
+    is appended to the ChoiceEvent log, or to the ``log`` list when given
+    so a batch of turns is written with one ``flush_log()``. Must run
+    inside a transaction. Raises TurnError if the choice cannot be played.
+    """
+    choices = event.get_choices()
+    if not isinstance(choice_index, int) or isinstance(choice_index, bool) \
+            or not 0 <= choice_index < len(choices):
+        raise TurnError("Invalid choice")
+
+    claimed = PlayerProgress.objects.filter(
+        pk=progress.pk, current_event=event
+    ).update(current_event=None, updated_at=timezone.now())
+    if not claimed:
+        raise TurnError("No current event")
+    progress.current_event = None
+
+    # Apply effects to player, clamped to bounds, and log what the choice
+    # actually changed
+    deltas = apply_choice(player, choices[choice_index]["effects"])
+    entry = ChoiceEvent(
+        player_id=player.id, event_id=event.id, choice_index=choice_index,
+        deltas=deltas, age_months=player.age_months,
+    )
+    if log is None:
+        entry.save()
+    else:
+        log.append(entry)
+
+    # Mark event as completed
+    EventCompletion.record(progress, event)
+    if counts is not None:
+        counts[event.id] = counts.get(event.id, 0) + 1
+
+
+def flush_log(log):
+    """Write the ChoiceEvents buffered by play_choice in one INSERT"""
+    ChoiceEvent.objects.bulk_create(log)
+    log.clear()
+
+
+def log_reset(player):
+    """Mark in the choice log that the player started over"""
+    ChoiceEvent.objects.create(player_id=player.id, age_months=player.age_months)
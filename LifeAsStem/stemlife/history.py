@@ -0,0 +1,73 @@
+"""The choice log: rebuilding players from it and keeping it small.
+
+``game.play_choice`` appends a ChoiceEvent for every choice made, with the
+changes it applied to the player's stats and the age it left them at, and
+``reset_game`` appends an entry without an event. Entries are never
+updated, so the log is a complete history of every player: ``replay()``
+rebuilds a player's state from it alone.
+
+Old entries are moved to ArchivedChoiceEvent by ``archive()`` (run by the
+``archive_choices`` command), keeping their ids, so the table written on
+every turn only holds recent history while replays still see all of it.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .game import EFFECT_FIELDS
+from .models import ArchivedChoiceEvent, ChoiceEvent, Player
+
+# Entries older than this are archived by default
+ARCHIVE_AFTER = timedelta(days=90)
+
+# Entries moved per transaction when archiving
+ARCHIVE_BATCH_SIZE = 5000
+
+# Columns copied from ChoiceEvent to ArchivedChoiceEvent
+LOG_FIELDS = ['id', 'player_id', 'event_id', 'choice_index', 'deltas', 'age_months', 'created_at']
+
+# Player columns rebuilt by replay()
+REPLAYED_FIELDS = list(EFFECT_FIELDS.values()) + ['age_months']
+
+
+def _initial_state():
+    return {field: Player._meta.get_field(field).default for field in REPLAYED_FIELDS}
+
+
+def replay(player_id):
+    """The player's stats and age after their last logged choice.
+
+    Reads the archived and the recent log in id order, starting over at
+    every reset. Players who skipped ahead to older events since their last
+    choice are a little older than this.
+    """
+    state = _initial_state()
+    for model in (ArchivedChoiceEvent, ChoiceEvent):
+        entries = model.objects.filter(player_id=player_id).order_by('id')
+        for event_id, deltas, age_months in entries.values_list('event_id', 'deltas', 'age_months'):
+            if event_id is None:
+                state = _initial_state()
+                continue
+            for field, delta in deltas.items():
+                state[field] += delta
+            state['age_months'] = age_months
+    return state
+
+
+def archive(before=None, batch_size=ARCHIVE_BATCH_SIZE):
+    """Move log entries created before ``before`` to the archive; returns how many"""
+    if before is None:
+        before = timezone.now() - ARCHIVE_AFTER
+    old = ChoiceEvent.objects.filter(created_at__lt=before)
+    moved = 0
+    while True:
+        with transaction.atomic():
+            rows = list(old.order_by('id').values(*LOG_FIELDS)[:batch_size])
+            if not rows:
+                break
+            ArchivedChoiceEvent.objects.bulk_create([ArchivedChoiceEvent(**row) for row in rows])
+            # Every old entry in this id range is in the batch
+            old.filter(id__gte=rows[0]['id'], id__lte=rows[-1]['id']).delete()
+        moved += len(rows)
+    return moved
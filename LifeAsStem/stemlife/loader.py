@@ -0,0 +1,269 @@
+"""Idempotent, streaming loading of LifeEvent definitions into the database.
+
+The catalog lives in a JSON Lines file (``data/life_events.jsonl`` by
+default), one event per line::
+
+    {"key": "infant-first-steps", "title": "First Steps", "description": "...",
+     "stage": "infant", "category": "development", "min_age": 0, "max_age": 2,
+     "frequency": "once", "choices": [{"text": "...", "science": 5, ...}, ...]}
+
+``stage``, ``category`` and ``frequency`` take the LifeEvent choice values;
+``key``, ``min_age``, ``max_age`` and ``frequency`` are optional, as are the
+effects of a choice (see ``EventChoice.EFFECTS``), which default to 0.
+``age_increment`` is in years and may be a fraction, in whole months. A
+record with any other field is rejected.
+
+Each definition is matched to its row by ``key`` (derived from stage and
+title when not given) and fingerprinted with a hash of its content, so
+loading the same catalog twice writes nothing. Records are read, validated
+and applied in fixed-size batches: new events are inserted with
+``bulk_create``, changed ones rewritten with ``bulk_update`` and their
+choices replaced. Memory use is bounded by the batch size, apart from the set
+of keys seen so far. The whole load runs in one transaction, and existing
+rows keep their ids, so player progress pointing at them survives a reload.
+"""
+import hashlib
+import itertools
+import json
+import time
+from pathlib import Path
+
+from django.db import transaction
+from django.utils.text import slugify
+
+from .catalog import invalidate_catalog
+from .models import MONTHS_PER_YEAR, EventChoice, LifeEvent
+
+DEFAULT_CATALOG = Path(__file__).resolve().parent / 'data' / 'life_events.jsonl'
+
+# Definitions read, diffed and written at a time
+BATCH_SIZE = 500
+
+# LifeEvent columns a definition sets, besides key and definition_hash
+EVENT_FIELDS = ['title', 'description', 'stage', 'category', 'min_age', 'max_age', 'frequency']
+REQUIRED_FIELDS = ['title', 'description', 'stage', 'category', 'choices']
+
+
+def event_key(stage, title):
+    return slugify(f'{stage} {title}')
+
+
+def _is_number(value, integer=True):
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (not integer and isinstance(value, float))
+
+
+def parse_definition(data):
+    """Validate one event definition and split it into fields and EventChoices.
+
+    Raises ValueError describing the first problem found.
+    """
+    if not isinstance(data, dict):
+        raise ValueError('expected an object')
+    unknown = set(data) - set(EVENT_FIELDS) - {'key', 'choices'}
+    if unknown:
+        raise ValueError(f'unknown fields: {", ".join(sorted(unknown))}')
+    missing = [name for name in REQUIRED_FIELDS if name not in data]
+    if missing:
+        raise ValueError(f'missing fields: {", ".join(missing)}')
+
+    fields = {name: data[name] for name in EVENT_FIELDS if name in data}
+    for name in ('key', 'title', 'description'):
+        if name in data and not (isinstance(data[name], str) and data[name]):
+            raise ValueError(f'{name} must be a non-empty string')
+    for name, values in (
+        ('stage', dict(LifeEvent.STAGE_CHOICES)),
+        ('category', dict(LifeEvent.CATEGORY_CHOICES)),
+        ('frequency', LifeEvent.FREQUENCY_LIMITS),
+    ):
+        if name in fields and fields[name] not in values:
+            raise ValueError(f'unknown {name}: {fields[name]!r}')
+    for name in ('min_age', 'max_age'):
+        if name in fields and not _is_number(fields[name]):
+            raise ValueError(f'{name} must be an integer')
+    if fields.get('min_age', 0) > fields.get('max_age', 100):
+        raise ValueError('min_age is greater than max_age')
+    if data.get('key'):
+        fields['key'] = data['key']
+
+    if not isinstance(data['choices'], list) or not data['choices']:
+        raise ValueError('choices must be a non-empty list')
+    choices = []
+    for position, choice in enumerate(data['choices']):
+        if not isinstance(choice, dict) or not isinstance(choice.get('text'), str) or not choice['text']:
+            raise ValueError(f'choice {position + 1} needs a text')
+        unknown = set(choice) - set(EventChoice.EFFECTS) - {'text'}
+        if unknown:
+            raise ValueError(f'choice {position + 1} has unknown effects: {", ".join(sorted(unknown))}')
+        for effect in EventChoice.EFFECTS:
+            # Ages may still move in fractions of a year
+            if effect in choice and not _is_number(choice[effect], integer=effect != 'age_increment'):
+                raise ValueError(f'choice {position + 1}: {effect} must be a number')
+        months = choice.get('age_increment', 0) * MONTHS_PER_YEAR
+        if months < 0 or months != round(months):
+            raise ValueError(f'choice {position + 1}: age_increment must be a whole number of months')
+        choices.append(EventChoice(position=position, **choice))
+    return fields, choices
+
+
+def read_definitions(path):
+    """Yield the parsed definitions of a JSON Lines catalog, one line at a time"""
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                definition = parse_definition(json.loads(line))
+            except ValueError as e:
+                # json.JSONDecodeError is a ValueError too
+                raise ValueError(f'{path}, line {line_number}: {e}') from e
+            yield definition
+
+
+def definition_hash(fields, choices):
+    """Fingerprint of an event's fields and choices, as stored on LifeEvent"""
+    content = {
+        'fields': {name: fields.get(name) for name in EVENT_FIELDS},
+        'choices': [
+            [choice.text] + [getattr(choice, effect) for effect in EventChoice.EFFECTS]
+            for choice in choices
+        ],
+    }
+    encoded = json.dumps(content, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class LoadResult:
+    """What a load changed (or would change, on a dry run), by event key"""
+
+    def __init__(self):
+        self.created = []
+        self.updated = []
+        self.unchanged = 0
+        self.missing = []
+        self.deleted = 0
+        self.timings = {}
+
+    @property
+    def changed(self):
+        return bool(self.created or self.updated or self.deleted)
+
+    def timed(self, phase, started):
+        self.timings[phase] = self.timings.get(phase, 0) + time.perf_counter() - started
+
+
+class EventLoader:
+    """Bring the LifeEvent table in line with a stream of parsed definitions.
+
+    Events in the table but not in the definitions are reported in
+    ``missing`` and only deleted with ``prune=True``, since deleting an
+    event also deletes the progress and completions that refer to it.
+    """
+
+    def __init__(self, dry_run=False, prune=False, batch_size=BATCH_SIZE):
+        self.dry_run = dry_run
+        self.prune = prune
+        self.batch_size = batch_size
+
+    def load(self, definitions):
+        result = LoadResult()
+        seen = set()
+        definitions = iter(definitions)
+        with transaction.atomic():
+            while True:
+                started = time.perf_counter()
+                batch = list(itertools.islice(definitions, self.batch_size))
+                result.timed('read', started)
+                if not batch:
+                    break
+                self._load_batch(batch, seen, result)
+            self._find_missing(seen, result)
+
+        if result.changed and not self.dry_run:
+            # Bulk writes send no signals, so refresh the event catalog by
+            # hand, once an enclosing transaction (if any) has committed
+            transaction.on_commit(invalidate_catalog)
+        return result
+
+    def _prepare(self, batch, seen):
+        """Key, fields, choices and hash of each definition, in order"""
+        prepared = {}
+        for fields, choices in batch:
+            fields = dict(fields)
+            key = fields.pop('key', None)
+            if not key:
+                # Repeated titles within a stage are numbered in file order
+                base = key = event_key(fields['stage'], fields['title'])
+                number = 1
+                while key in seen:
+                    number += 1
+                    key = f'{base}-{number}'
+            elif key in seen:
+                raise ValueError(f'Duplicate event key: {key}')
+            seen.add(key)
+            prepared[key] = (fields, choices, definition_hash(fields, choices))
+        return prepared
+
+    def _load_batch(self, batch, seen, result):
+        started = time.perf_counter()
+        prepared = self._prepare(batch, seen)
+        existing = {
+            key: (event_id, stored_hash)
+            for event_id, key, stored_hash in LifeEvent.objects.filter(
+                key__in=list(prepared)
+            ).values_list('id', 'key', 'definition_hash')
+        }
+        to_create = []
+        to_update = []
+        for key, (fields, choices, digest) in prepared.items():
+            if key not in existing:
+                to_create.append(key)
+            elif existing[key][1] != digest:
+                to_update.append(key)
+            else:
+                result.unchanged += 1
+        result.created += to_create
+        result.updated += to_update
+        result.timed('diff', started)
+
+        if not self.dry_run and (to_create or to_update):
+            started = time.perf_counter()
+            self._write(prepared, existing, to_create, to_update)
+            result.timed('write', started)
+
+    def _write(self, prepared, existing, to_create, to_update):
+        LifeEvent.objects.bulk_create([
+            LifeEvent(key=key, definition_hash=prepared[key][2], **prepared[key][0])
+            for key in to_create
+        ])
+        # Not every backend returns ids from bulk_create, so look them up
+        ids = dict(LifeEvent.objects.filter(key__in=to_create).values_list('key', 'id'))
+
+        updated_events = []
+        for key in to_update:
+            fields, choices, digest = prepared[key]
+            event = LifeEvent(id=existing[key][0], key=key, definition_hash=digest, **fields)
+            updated_events.append(event)
+            ids[key] = event.id
+        LifeEvent.objects.bulk_update(updated_events, EVENT_FIELDS + ['definition_hash'])
+
+        # Choices of changed events are replaced wholesale
+        EventChoice.objects.filter(event_id__in=[ids[key] for key in to_update]).delete()
+        event_choices = []
+        for key in to_create + to_update:
+            for choice in prepared[key][1]:
+                choice.event_id = ids[key]
+                event_choices.append(choice)
+        EventChoice.objects.bulk_create(event_choices)
+
+    def _find_missing(self, seen, result):
+        started = time.perf_counter()
+        keys = LifeEvent.objects.values_list('key', flat=True).iterator(chunk_size=self.batch_size)
+        result.missing = [key for key in keys if key not in seen]
+        if self.prune and result.missing:
+            if not self.dry_run:
+                for start in range(0, len(result.missing), self.batch_size):
+                    LifeEvent.objects.filter(key__in=result.missing[start:start + self.batch_size]).delete()
+            result.deleted = len(result.missing)
+        result.timed('prune' if self.prune else 'diff', started)
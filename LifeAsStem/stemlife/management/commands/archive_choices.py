@@ -0,0 +1,30 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from stemlife.history import ARCHIVE_AFTER, ARCHIVE_BATCH_SIZE, archive
+
+
+class Command(BaseCommand):
+    help = 'Move old choice log entries to the archive table, keeping the live log small'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=ARCHIVE_AFTER.days,
+            help='Archive entries older than this many days',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=ARCHIVE_BATCH_SIZE,
+            help='Number of entries moved per transaction',
+        )
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        started = time.perf_counter()
+        moved = archive(before, batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {moved} choice log entries older than {before:%Y-%m-%d %H:%M} in {elapsed:.2f}s'
+        ))
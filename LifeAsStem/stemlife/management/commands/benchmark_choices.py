@@ -0,0 +1,93 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from stemlife.game import EFFECT_FIELDS, STAT_MAX, STAT_MIN, age_increment, play_choice
+from stemlife.models import EventChoice, LifeEvent, Player, PlayerProgress, User
+
+# A typical choice: a handful of stats move, the rest stay put
+SAMPLE_EFFECTS = {
+    'science': 5, 'technology': 0, 'engineering': 3, 'math': 0,
+    'health': 0, 'intelligence': 8, 'creativity': 0, 'logic': 5, 'social': 0,
+    'age_increment': 1,
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+def legacy_turn(player, progress, event, choice_index):
+    """A make_choice turn as it was: mutate every stat, save() everything"""
+    effects = event.get_choices()[choice_index]['effects']
+    for effect, field in EFFECT_FIELDS.items():
+        setattr(player, field, getattr(player, field) + effects.get(effect, 0))
+    player.age_months += age_increment(effects)
+    for field in EFFECT_FIELDS.values():
+        setattr(player, field, max(STAT_MIN, min(STAT_MAX, getattr(player, field))))
+    player.save()
+
+    progress.completed_events.add(event)
+    progress.current_event = None
+    progress.save()
+
+
+class Command(BaseCommand):
+    help = 'Compare the queries of a make_choice turn as it was, with save(), and as it is now'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=500, help='Choices to play per strategy')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        self.stdout.write(f'Database: {connection.vendor}, {iterations} choices per strategy')
+
+        # Work on a throwaway player and event and roll everything back afterwards
+        try:
+            with transaction.atomic():
+                user = User.objects.create(username=f'benchmark-{uuid.uuid4().hex[:12]}')
+                player = Player.objects.create(name='Benchmark', creator=user)
+                progress = PlayerProgress.objects.create(player=player)
+                event = LifeEvent.objects.create(
+                    key=f'benchmark-{uuid.uuid4().hex[:12]}', title='Benchmark', description='',
+                    stage='infant', category='development', min_age=0, max_age=200,
+                )
+                EventChoice.objects.create(event=event, position=0, text='Benchmark', **{
+                    effect: value for effect, value in SAMPLE_EFFECTS.items() if effect != 'age_increment'
+                }, age_increment=SAMPLE_EFFECTS['age_increment'])
+                # make_choice plays the catalog copy, whose choices are prefetched
+                event = LifeEvent.objects.prefetch_related('choices').get(pk=event.pk)
+                for label, turn in [('save()', legacy_turn), ('UPDATE', play_choice)]:
+                    self.run(label, turn, progress, event, iterations)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, label, turn, progress, event, iterations):
+        elapsed = 0
+        sql = []
+        for _ in range(iterations):
+            # Not measured: make the event pending again for the next turn
+            PlayerProgress.objects.filter(pk=progress.pk).update(current_event=event)
+
+            start = time.perf_counter()
+            with CaptureQueriesContext(connection) as queries:
+                # Every make_choice request loads the player and progress first
+                progress = PlayerProgress.objects.select_related('player').get(pk=progress.pk)
+                turn(progress.player, progress, event, 0)
+            elapsed += time.perf_counter() - start
+            sql += [query['sql'] for query in queries.captured_queries]
+
+        writes = [statement for statement in sql if not statement.startswith('SELECT')]
+        # The stat update itself, apart from the claim, log and completion writes
+        stats = [statement for statement in writes if statement.startswith('UPDATE "stemlife_player"')]
+        self.stdout.write(
+            f'{label:>8}: {len(sql) / iterations:.1f} queries/choice, '
+            f'{len(writes) / iterations:.1f} writes/choice, '
+            f'{sum(map(len, writes)) / iterations:.0f} write bytes/choice '
+            f'({sum(map(len, stats)) / iterations:.0f} for the stats), '
+            f'{elapsed * 1000 / iterations:.3f} ms/choice'
+        )
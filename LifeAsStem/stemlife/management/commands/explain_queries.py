@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.http import QueryDict
+
+from stemlife import questions
+from stemlife.models import EventCompletion, LifeEvent, Player, PlayerProgress
+
+
+def hot_queries():
+    """The queries the game runs per request, with representative arguments"""
+    return [
+        ('Player id for a user (load_player, cache miss)',
+         Player.objects.filter(users=1).values_list('id', flat=True)),
+        ('Player and progress (load_player)',
+         PlayerProgress.objects.select_related('player').filter(player_id=1)),
+        ('Completion counts (game.completion_counts, cache miss)',
+         EventCompletion.objects.filter(progress_id=1).values_list('event_id', 'count')),
+        ('Event catalog (catalog.get_catalog, on reload)',
+         LifeEvent.objects.order_by('id')),
+        ('Question listing (get_questions, cache miss)',
+         questions.filtered(QueryDict('category=math'), with_id=False)),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Print the database query plan of each hot query the game runs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--analyze', action='store_true',
+            help='Run the queries and report actual costs (PostgreSQL only)',
+        )
+
+    def handle(self, *args, **options):
+        explain_options = {}
+        if options['analyze']:
+            if connection.vendor != 'postgresql':
+                raise CommandError('--analyze is only supported on PostgreSQL')
+            explain_options['analyze'] = True
+
+        self.stdout.write(f'Database: {connection.vendor}')
+        for label, queryset in hot_queries():
+            self.stdout.write('')
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(str(queryset.query))
+            self.stdout.write(queryset.explain(**explain_options))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from stemlife import analytics
+
+
+class Command(BaseCommand):
+    help = 'Refresh the materialized player analytics served by analytics/, recomputing only what changed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Recompute every section, even those whose data did not change',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        changed = analytics.refresh(full=options['full'])
+        elapsed = time.perf_counter() - started
+
+        if changed:
+            self.stdout.write(self.style.SUCCESS(
+                f'Refreshed {len(changed)} sections in {elapsed * 1000:.1f}ms: {", ".join(changed)}'
+            ))
+        else:
+            self.stdout.write(f'Nothing changed since the last refresh ({elapsed * 1000:.1f}ms)')
+        if options['verbosity'] > 1:
+            for stage in analytics.summary()['stages']:
+                fields = ', '.join(f'{field} {count}' for field, count in stage['recommendations'].items())
+                self.stdout.write(f'  {stage["stage"]}: {stage["players"]} players ({fields})')
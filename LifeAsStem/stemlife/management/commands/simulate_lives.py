@@ -0,0 +1,75 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from stemlife.catalog import get_catalog
+from stemlife.models import MONTHS_PER_YEAR
+from stemlife.recommendation import FIELDS, score
+from stemlife.simulation import CHUNK_SIZE, CatalogArrays, simulate
+from stemlife.stages import STAGES
+
+
+class Command(BaseCommand):
+    help = 'Simulate random lives through the event catalog and report how they turn out'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lives', type=int, default=100_000, help='Number of lives to simulate')
+        parser.add_argument('--max-turns', type=int, default=500, help='Turns after which a life is stopped')
+        parser.add_argument('--seed', type=int, help='Random seed, for repeatable runs')
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE,
+            help='Lives simulated together; lower it to use less memory',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        catalog = CatalogArrays(get_catalog().events.values())
+        if not len(catalog):
+            raise CommandError('The event catalog is empty; run populate_events first')
+        loaded = time.perf_counter()
+
+        lives = options['lives']
+        result = simulate(
+            catalog, lives, max_turns=options['max_turns'], seed=options['seed'],
+            chunk_size=options['chunk_size'],
+        )
+        elapsed = time.perf_counter() - loaded
+        self.stdout.write(
+            f'Simulated {lives} lives over {len(catalog)} events in {elapsed:.2f}s '
+            f'(catalog loaded in {loaded - started:.2f}s)'
+        )
+
+        self.section('STEM recommendation at the end of life')
+        age = result.age_months / MONTHS_PER_YEAR
+        adult = age >= 18
+        picks, margins = score(result.stats)
+        for label, name in enumerate(FIELDS):
+            chosen = picks == label
+            margin = np.median(margins[chosen]) if chosen.any() else 0
+            self.share(name, np.count_nonzero(chosen), lives,
+                       f'{np.count_nonzero(chosen & adult)} of them aged 18+, median margin {margin:.0f}')
+
+        self.section('Age reached')
+        percentiles = np.percentile(age, [0, 10, 50, 90, 100])
+        self.stdout.write('  min {:.1f}, p10 {:.1f}, median {:.1f}, p90 {:.1f}, max {:.1f}'.format(*percentiles))
+        self.stdout.write(f'  turns played: median {np.median(result.turns):.0f}, max {result.turns.max()}')
+
+        self.section('Where lives ran out of events')
+        for index, stage in enumerate(STAGES):
+            self.share(stage, np.count_nonzero(result.dead_end == index), lives)
+        self.share('(stopped by --max-turns)', np.count_nonzero(result.dead_end == -1), lives)
+
+        never = [key for key, count in zip(catalog.keys, result.picks) if not count]
+        if never:
+            self.section(f'Events never picked ({len(never)})')
+            for key in never:
+                self.stdout.write(f'  {key}')
+
+    def section(self, title):
+        self.stdout.write('')
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+
+    def share(self, label, count, total, note=''):
+        note = f'  ({note})' if note else ''
+        self.stdout.write(f'  {label:<28} {count:>10} {100 * count / total:6.2f}%{note}')
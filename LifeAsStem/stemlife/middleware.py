@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.core.cache import cache as django_cache
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+from . import cache
+
+
+def get_cached_user(request):
+    """Resolve the session's user, checking it against the cache when possible.
+
+    Behaves like ``django.contrib.auth.get_user`` (including the session
+    hash check), but a cache hit costs no query: only the user's session
+    hash is cached, and the user comes back with just its id loaded, the
+    other fields being read on first use. Without a shared cache, on a miss
+    and for anything unusual it falls back to ``get_user`` itself.
+    """
+    if not settings.STEMLIFE_SHARED_CACHE:
+        # A password change in another process could not drop the entry
+        return auth.get_user(request)
+    try:
+        user_id = auth._get_user_session_key(request)
+        backend_path = request.session[auth.BACKEND_SESSION_KEY]
+    except KeyError:
+        return auth.get_user(request)
+
+    key = cache.user_key(user_id)
+    user_hash = django_cache.get(key)
+    if user_hash is None or backend_path not in settings.AUTHENTICATION_BACKENDS:
+        user = auth.get_user(request)
+        if user.is_authenticated:
+            django_cache.set(key, user.get_session_auth_hash(), cache.USER_TIMEOUT)
+        return user
+
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    if not (session_hash and constant_time_compare(session_hash, user_hash)):
+        # Let get_user deal with legacy hashes and flushing the session
+        return auth.get_user(request)
+
+    user = auth.get_user_model().from_db(None, ['id'], [user_id])
+    user.backend = backend_path
+    return user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware that checks sessions against the cache"""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
@@ -2,6 +2,8 @@
 
 from django.db import migrations, models
 
+from stemlife.operations import AddFieldIfMissing
+
 
 class Migration(migrations.Migration):
 
@@ -10,7 +12,7 @@ class Migration(migrations.Migration):
     ]
 
     operations = [
-        migrations.AddField(
+        AddFieldIfMissing(
             model_name='questions',
             name='age',
             field=models.CharField(default=10, max_length=250),
@@ -2,6 +2,8 @@
 
 from django.db import migrations, models
 
+from stemlife.operations import AddFieldIfMissing
+
 
 class Migration(migrations.Migration):
 
@@ -10,33 +12,33 @@ class Migration(migrations.Migration):
     ]
 
     operations = [
-        migrations.AddField(
+        AddFieldIfMissing(
             model_name='questions',
             name='age',
             field=models.CharField(default=10, max_length=256),
             preserve_default=False,
         ),
-        migrations.AddField(
+        AddFieldIfMissing(
             model_name='questions',
             name='answer1',
             field=models.CharField(default='', max_length=256),
         ),
-        migrations.AddField(
+        AddFieldIfMissing(
             model_name='questions',
             name='answer2',
             field=models.CharField(default='', max_length=256),
         ),
-        migrations.AddField(
+        AddFieldIfMissing(
             model_name='questions',
             name='answer3',
             field=models.CharField(default='', max_length=256),
         ),
-        migrations.AddField(
+        AddFieldIfMissing(
             model_name='questions',
             name='answer4',
             field=models.CharField(default='', max_length=256),
         ),
-        migrations.AddField(
+        AddFieldIfMissing(
             model_name='questions',
             name='category',
             field=models.CharField(default='General', max_length=256),
@@ -2,6 +2,8 @@
 
 from django.db import migrations, models
 
+from stemlife.operations import AddFieldIfMissing
+
 
 class Migration(migrations.Migration):
 
@@ -10,22 +12,22 @@ class Migration(migrations.Migration):
     ]
 
     operations = [
-        migrations.AddField(
+        AddFieldIfMissing(
             model_name='questions',
             name='answer1',
             field=models.CharField(default='', max_length=256),
         ),
-        migrations.AddField(
+        AddFieldIfMissing(
             model_name='questions',
             name='answer2',
             field=models.CharField(default='', max_length=256),
         ),
-        migrations.AddField(
+        AddFieldIfMissing(
             model_name='questions',
             name='answer3',
             field=models.CharField(default='', max_length=256),
         ),
-        migrations.AddField(
+        AddFieldIfMissing(
             model_name='questions',
             name='answer4',
             field=models.CharField(default='', max_length=256),
@@ -0,0 +1,51 @@
+# Generated by Django 3.2.25 on 2026-10-18 10:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def copy_completed_events(apps, schema_editor):
+    PlayerProgress = apps.get_model('stemlife', 'PlayerProgress')
+    EventCompletion = apps.get_model('stemlife', 'EventCompletion')
+    Through = PlayerProgress.completed_events.through
+
+    # The old many-to-many could only remember one completion per event
+    EventCompletion.objects.bulk_create(
+        EventCompletion(progress_id=progress_id, event_id=event_id, count=1)
+        for progress_id, event_id in Through.objects.values_list('playerprogress_id', 'lifeevent_id').iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stemlife', '0010_auto_20250814_1547'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventCompletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=1)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='completions', to='stemlife.lifeevent')),
+                ('progress', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='completions', to='stemlife.playerprogress')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='eventcompletion',
+            constraint=models.UniqueConstraint(fields=('progress', 'event'), name='unique_event_completion'),
+        ),
+        migrations.RunPython(copy_completed_events, migrations.RunPython.noop),
+        # Django cannot add a through model to an existing many-to-many, so
+        # drop the auto-created table and re-add the field on top of the ledger
+        migrations.RemoveField(
+            model_name='playerprogress',
+            name='completed_events',
+        ),
+        migrations.AddField(
+            model_name='playerprogress',
+            name='completed_events',
+            field=models.ManyToManyField(related_name='completed_by', through='stemlife.EventCompletion', to='stemlife.LifeEvent'),
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+EFFECTS = [
+    'science', 'technology', 'engineering', 'math', 'health',
+    'intelligence', 'creativity', 'logic', 'social', 'age_increment',
+]
+
+
+def columns_to_choices(apps, schema_editor):
+    LifeEvent = apps.get_model('stemlife', 'LifeEvent')
+    EventChoice = apps.get_model('stemlife', 'EventChoice')
+
+    choices = []
+    for event in LifeEvent.objects.iterator():
+        position = 0
+        for number in (1, 2, 3):
+            text = getattr(event, f'choice{number}_text')
+            # choice3 was optional, choices 1 and 2 are always kept
+            if number == 3 and not text:
+                continue
+            choices.append(EventChoice(
+                event=event,
+                position=position,
+                text=text or '',
+                **{effect: getattr(event, f'choice{number}_{effect}') for effect in EFFECTS}
+            ))
+            position += 1
+    EventChoice.objects.bulk_create(choices)
+
+
+def choices_to_columns(apps, schema_editor):
+    LifeEvent = apps.get_model('stemlife', 'LifeEvent')
+    EventChoice = apps.get_model('stemlife', 'EventChoice')
+
+    for event in LifeEvent.objects.iterator():
+        for choice in EventChoice.objects.filter(event=event, position__lt=3):
+            number = choice.position + 1
+            setattr(event, f'choice{number}_text', choice.text)
+            for effect in EFFECTS:
+                setattr(event, f'choice{number}_{effect}', getattr(choice, effect))
+        event.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stemlife', '0011_eventcompletion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventChoice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField()),
+                ('text', models.CharField(max_length=200)),
+                ('science', models.IntegerField(default=0)),
+                ('technology', models.IntegerField(default=0)),
+                ('engineering', models.IntegerField(default=0)),
+                ('math', models.IntegerField(default=0)),
+                ('health', models.IntegerField(default=0)),
+                ('intelligence', models.IntegerField(default=0)),
+                ('creativity', models.IntegerField(default=0)),
+                ('logic', models.IntegerField(default=0)),
+                ('social', models.IntegerField(default=0)),
+                ('age_increment', models.IntegerField(default=0)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='choices', to='stemlife.lifeevent')),
+            ],
+            options={
+                'ordering': ['event', 'position'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='eventchoice',
+            constraint=models.UniqueConstraint(fields=('event', 'position'), name='unique_event_choice_position'),
+        ),
+        migrations.RunPython(columns_to_choices, choices_to_columns),
+        # Give the required text columns a default so the removal below can
+        # be reversed on a populated table
+        migrations.AlterField(
+            model_name='lifeevent',
+            name='choice1_text',
+            field=models.CharField(default='', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='lifeevent',
+            name='choice2_text',
+            field=models.CharField(default='', max_length=200),
+        ),
+    ] + [
+        migrations.RemoveField(
+            model_name='lifeevent',
+            name=f'choice{number}_{column}',
+        )
+        for number in (1, 2, 3)
+        for column in ['text'] + EFFECTS
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def drop_duplicate_progress(apps, schema_editor):
+    PlayerProgress = apps.get_model('stemlife', 'PlayerProgress')
+
+    # Views always expected a single progress row per player; keep the most
+    # recently updated one before enforcing that
+    seen = set()
+    duplicates = []
+    for progress_id, player_id in PlayerProgress.objects.order_by('player_id', '-updated_at', '-id').values_list('id', 'player_id'):
+        if player_id in seen:
+            duplicates.append(progress_id)
+        seen.add(player_id)
+    PlayerProgress.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stemlife', '0012_eventchoice'),
+    ]
+
+    operations = [
+        # Give the auto-created Player.users table an explicit model, without
+        # touching the table itself, so it can carry its own indexes
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='PlayerUser',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='stemlife.player')),
+                        ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='stemlife.user')),
+                    ],
+                    options={
+                        'db_table': 'stemlife_player_users',
+                        'unique_together': {('player', 'user')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='player',
+                    name='users',
+                    field=models.ManyToManyField(blank=True, through='stemlife.PlayerUser', to='stemlife.User'),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='playeruser',
+            index=models.Index(fields=['user', 'player'], name='player_users_user_player_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lifeevent',
+            index=models.Index(fields=['stage', 'min_age', 'max_age'], name='lifeevent_stage_age_idx'),
+        ),
+        migrations.RunPython(drop_duplicate_progress, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='playerprogress',
+            constraint=models.UniqueConstraint(fields=('player',), name='unique_progress_per_player'),
+        ),
+    ]
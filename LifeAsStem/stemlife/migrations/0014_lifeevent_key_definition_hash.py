@@ -0,0 +1,50 @@
+# Generated by Django 3.2.25 on 2026-10-18 14:20
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def fill_keys(apps, schema_editor):
+    # Same keys populate_events derives, so existing rows are matched
+    # rather than recreated on the next load
+    LifeEvent = apps.get_model('stemlife', 'LifeEvent')
+
+    seen = set()
+    events = []
+    for event in LifeEvent.objects.order_by('id').only('id', 'stage', 'title'):
+        base = key = slugify(f'{event.stage} {event.title}')
+        number = 1
+        while key in seen:
+            number += 1
+            key = f'{base}-{number}'
+        seen.add(key)
+        event.key = key
+        events.append(event)
+    LifeEvent.objects.bulk_update(events, ['key'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stemlife', '0013_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lifeevent',
+            name='key',
+            field=models.SlugField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='lifeevent',
+            name='definition_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='lifeevent',
+            name='key',
+            field=models.SlugField(max_length=255, unique=True),
+        ),
+    ]
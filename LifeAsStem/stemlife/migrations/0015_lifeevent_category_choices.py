@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stemlife', '0014_lifeevent_key_definition_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='lifeevent',
+            name='category',
+            field=models.CharField(choices=[('development', 'Development'), ('education', 'Education'), ('social', 'Social'), ('health', 'Health'), ('play', 'Play'), ('technology', 'Technology'), ('career', 'Career'), ('fun', 'Fun'), ('family', 'Family'), ('hobby', 'Hobby'), ('adventure', 'Adventure'), ('friendship', 'Friendship'), ('engineering', 'Engineering'), ('creativity', 'Creativity')], max_length=50),
+        ),
+    ]
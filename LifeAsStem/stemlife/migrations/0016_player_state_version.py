@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stemlife', '0015_lifeevent_category_choices'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='state_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
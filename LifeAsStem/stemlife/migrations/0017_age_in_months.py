@@ -0,0 +1,60 @@
+# Generated by Django 3.2.25 on 2026-10-18 16:05
+
+from django.db import migrations, models
+from django.db.models import F
+
+MONTHS_PER_YEAR = 12
+
+
+def years_to_months(apps, schema_editor):
+    Player = apps.get_model('stemlife', 'Player')
+    EventChoice = apps.get_model('stemlife', 'EventChoice')
+    LifeEvent = apps.get_model('stemlife', 'LifeEvent')
+
+    Player.objects.filter(age_months__lt=0).update(age_months=0)
+    Player.objects.update(age_months=F('age_months') * MONTHS_PER_YEAR)
+    # A negative increment meant the default one, as does 0
+    EventChoice.objects.filter(age_months__lt=0).update(age_months=0)
+    EventChoice.objects.update(age_months=F('age_months') * MONTHS_PER_YEAR)
+    # Half-year increments were truncated to whole years when stored, so
+    # have the next populate_events rewrite every event from its definition
+    LifeEvent.objects.update(definition_hash='')
+
+
+def months_to_years(apps, schema_editor):
+    Player = apps.get_model('stemlife', 'Player')
+    EventChoice = apps.get_model('stemlife', 'EventChoice')
+
+    Player.objects.update(age_months=F('age_months') / MONTHS_PER_YEAR)
+    EventChoice.objects.update(age_months=F('age_months') / MONTHS_PER_YEAR)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stemlife', '0016_player_state_version'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='player',
+            old_name='age',
+            new_name='age_months',
+        ),
+        migrations.RenameField(
+            model_name='eventchoice',
+            old_name='age_increment',
+            new_name='age_months',
+        ),
+        migrations.RunPython(years_to_months, months_to_years),
+        migrations.AlterField(
+            model_name='player',
+            name='age_months',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='eventchoice',
+            name='age_months',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stemlife', '0017_age_in_months'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CohortSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=50, unique=True)),
+                ('fingerprint', models.CharField(max_length=64)),
+                ('data', models.JSONField(default=dict)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+        ),
+    ]
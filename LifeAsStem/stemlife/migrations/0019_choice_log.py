@@ -0,0 +1,51 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stemlife', '0018_cohortsummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChoiceEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('choice_index', models.PositiveSmallIntegerField(null=True)),
+                ('deltas', models.JSONField(default=dict)),
+                ('age_months', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('event', models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='stemlife.lifeevent')),
+                ('player', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='stemlife.player')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedChoiceEvent',
+            fields=[
+                ('choice_index', models.PositiveSmallIntegerField(null=True)),
+                ('deltas', models.JSONField(default=dict)),
+                ('age_months', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('event', models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='stemlife.lifeevent')),
+                ('player', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='stemlife.player')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='choiceevent',
+            index=models.Index(fields=['player', 'id'], name='choiceevent_player_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='choiceevent',
+            index=models.Index(fields=['created_at'], name='choiceevent_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedchoiceevent',
+            index=models.Index(fields=['player', 'id'], name='archivedchoice_player_idx'),
+        ),
+    ]
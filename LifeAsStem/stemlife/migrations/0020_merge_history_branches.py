@@ -0,0 +1,14 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:55
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stemlife', '0008_user_engineering_user_mathematics_user_science_and_more'),
+        ('stemlife', '0019_choice_log'),
+    ]
+
+    operations = [
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stemlife', '0020_merge_history_branches'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='player',
+            name='engineering',
+        ),
+        migrations.RemoveField(
+            model_name='player',
+            name='mathematics',
+        ),
+        migrations.RemoveField(
+            model_name='player',
+            name='science',
+        ),
+        migrations.RemoveField(
+            model_name='player',
+            name='technology',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='engineering',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='mathematics',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='science',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='technology',
+        ),
+        migrations.AlterField(
+            model_name='questions',
+            name='age',
+            field=models.CharField(max_length=250),
+        ),
+        migrations.AlterField(
+            model_name='questions',
+            name='answer1',
+            field=models.CharField(default='', max_length=256),
+        ),
+        migrations.AlterField(
+            model_name='questions',
+            name='answer2',
+            field=models.CharField(default='', max_length=256),
+        ),
+        migrations.AlterField(
+            model_name='questions',
+            name='category',
+            field=models.CharField(max_length=250),
+        ),
+    ]
@@ -1,6 +1,18 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
-import random
+
+from .recommendation import STAT_FIELDS, recommend
+
+# Ages are stored in whole months, so half-year steps add up exactly
+MONTHS_PER_YEAR = 12
+
+
+def years(months):
+    """A number of months in years, as an int when it is a whole number"""
+    whole, rest = divmod(months, MONTHS_PER_YEAR)
+    return months / MONTHS_PER_YEAR if rest else whole
 
 # Create your models here.
 class User(AbstractUser):
@@ -8,11 +20,11 @@ class User(AbstractUser):
 
 class Player(models.Model):
     name = models.CharField(max_length=50)
-    users = models.ManyToManyField('User', blank=True)
+    users = models.ManyToManyField('User', through='PlayerUser', blank=True)
     creator = models.ForeignKey('User', on_delete=models.CASCADE, blank=False, null=False, related_name="maker")
     
     # Life simulation attributes
-    age = models.IntegerField(default=0)
+    age_months = models.PositiveIntegerField(default=0)
     health = models.IntegerField(default=100)
     intelligence = models.IntegerField(default=50)
     creativity = models.IntegerField(default=50)
@@ -27,32 +39,49 @@ class Player(models.Model):
     engineering_interest = models.IntegerField(default=0)
     math_interest = models.IntegerField(default=0)
     
+    # Bumped on every change to the game state, used as the ETag of state reads
+    state_version = models.PositiveIntegerField(default=0)
+    
     def __str__(self):
         return f'{self.name} (Age: {self.age})'
     
+    @property
+    def age(self):
+        """Age in whole years, which stages and event age ranges go by"""
+        return self.age_months // MONTHS_PER_YEAR
+    
+    def serialize(self):
+        return {
+            "age": self.age,
+            "age_months": self.age_months,
+            "health": self.health,
+            "intelligence": self.intelligence,
+            "creativity": self.creativity,
+            "logic": self.logic,
+            "social_skills": self.social_skills,
+            "science_interest": self.science_interest,
+            "technology_interest": self.technology_interest,
+            "engineering_interest": self.engineering_interest,
+            "math_interest": self.math_interest
+        }
+    
     def get_stem_recommendation(self):
         """Calculate STEM field recommendation based on player's interests and stats"""
-        interests = {
-            'Science': self.science_interest,
-            'Technology': self.technology_interest,
-            'Engineering': self.engineering_interest,
-            'Mathematics': self.math_interest
-        }
-        
-        # Sort by interest level
-        sorted_interests = sorted(interests.items(), key=lambda x: x[1], reverse=True)
-        
-        # Consider other stats for final recommendation
-        if self.logic > 70 and self.math_interest > 60:
-            return "Mathematics"
-        elif self.creativity > 70 and self.science_interest > 60:
-            return "Science"
-        elif self.intelligence > 70 and self.technology_interest > 60:
-            return "Technology"
-        elif self.logic > 60 and self.engineering_interest > 60:
-            return "Engineering"
-        else:
-            return sorted_interests[0][0]
+        field, _ = recommend([[getattr(self, name) for name in STAT_FIELDS]])[0]
+        return field
+
+class PlayerUser(models.Model):
+    """Membership of a user in a player, the table behind Player.users"""
+    player = models.ForeignKey(Player, on_delete=models.CASCADE)
+    user = models.ForeignKey('User', on_delete=models.CASCADE)
+    
+    class Meta:
+        db_table = 'stemlife_player_users'
+        unique_together = [['player', 'user']]
+        indexes = [
+            # Covers the user -> player lookup made on every game request
+            models.Index(fields=['user', 'player'], name='player_users_user_player_idx'),
+        ]
 
 class LifeEvent(models.Model):
     STAGE_CHOICES = [
@@ -77,8 +106,12 @@ class LifeEvent(models.Model):
         ('hobby', 'Hobby'),
         ('adventure', 'Adventure'),
         ('friendship', 'Friendship'),
+        ('engineering', 'Engineering'),
+        ('creativity', 'Creativity'),
     ]
     
+    # Stable natural key used by populate_events to match definitions to rows
+    key = models.SlugField(max_length=255, unique=True)
     title = models.CharField(max_length=200)
     description = models.TextField()
     stage = models.CharField(max_length=20, choices=STAGE_CHOICES)
@@ -94,109 +127,216 @@ class LifeEvent(models.Model):
         ('common', 'Common event')
     ], default='once')
     
-    # Choice options
-    choice1_text = models.CharField(max_length=200)
-    choice1_science = models.IntegerField(default=0)
-    choice1_technology = models.IntegerField(default=0)
-    choice1_engineering = models.IntegerField(default=0)
-    choice1_math = models.IntegerField(default=0)
-    choice1_health = models.IntegerField(default=0)
-    choice1_intelligence = models.IntegerField(default=0)
-    choice1_creativity = models.IntegerField(default=0)
-    choice1_logic = models.IntegerField(default=0)
-    choice1_social = models.IntegerField(default=0)
-    choice1_age_increment = models.IntegerField(default=0)  # How much to age after this choice
-    
-    choice2_text = models.CharField(max_length=200)
-    choice2_science = models.IntegerField(default=0)
-    choice2_technology = models.IntegerField(default=0)
-    choice2_engineering = models.IntegerField(default=0)
-    choice2_math = models.IntegerField(default=0)
-    choice2_health = models.IntegerField(default=0)
-    choice2_intelligence = models.IntegerField(default=0)
-    choice2_creativity = models.IntegerField(default=0)
-    choice2_logic = models.IntegerField(default=0)
-    choice2_social = models.IntegerField(default=0)
-    choice2_age_increment = models.IntegerField(default=0)  # How much to age after this choice
-    
-    choice3_text = models.CharField(max_length=200, blank=True, null=True)
-    choice3_science = models.IntegerField(default=0)
-    choice3_technology = models.IntegerField(default=0)
-    choice3_engineering = models.IntegerField(default=0)
-    choice3_math = models.IntegerField(default=0)
-    choice3_health = models.IntegerField(default=0)
-    choice3_intelligence = models.IntegerField(default=0)
-    choice3_creativity = models.IntegerField(default=0)
-    choice3_logic = models.IntegerField(default=0)
-    choice3_social = models.IntegerField(default=0)
-    choice3_age_increment = models.IntegerField(default=0)  # How much to age after this choice
+    # Hash of the definition the event was loaded from, to skip unchanged ones
+    definition_hash = models.CharField(max_length=64, blank=True, editable=False)
+    
+    class Meta:
+        indexes = [
+            # Matches the stage and age range filter used to pick events
+            models.Index(fields=['stage', 'min_age', 'max_age'], name='lifeevent_stage_age_idx'),
+        ]
+    
+    # How many times a player may complete an event of each frequency
+    FREQUENCY_LIMITS = {
+        'once': 1,
+        'rare': 1,
+        'multiple': 3,
+        'common': 5,
+    }
     
     def __str__(self):
         return f'{self.title} ({self.stage})'
     
     def get_choices(self):
-        choices = [
+        # Uses prefetched choices when the event was loaded with them
+        return [
             {
-                'text': self.choice1_text,
-                'effects': {
-                    'science': self.choice1_science,
-                    'technology': self.choice1_technology,
-                    'engineering': self.choice1_engineering,
-                    'math': self.choice1_math,
-                    'health': self.choice1_health,
-                    'intelligence': self.choice1_intelligence,
-                    'creativity': self.choice1_creativity,
-                    'logic': self.choice1_logic,
-                    'social': self.choice1_social,
-                    'age_increment': self.choice1_age_increment,
-                }
-            },
-            {
-                'text': self.choice2_text,
-                'effects': {
-                    'science': self.choice2_science,
-                    'technology': self.choice2_technology,
-                    'engineering': self.choice2_engineering,
-                    'math': self.choice2_math,
-                    'health': self.choice2_health,
-                    'intelligence': self.choice2_intelligence,
-                    'creativity': self.choice2_creativity,
-                    'logic': self.choice2_logic,
-                    'social': self.choice2_social,
-                    'age_increment': self.choice2_age_increment,
-                }
+                'text': choice.text,
+                'effects': choice.get_effects(),
             }
+            for choice in self.choices.all()
+        ]
+
+class EventChoice(models.Model):
+    """One option a player can pick for a LifeEvent, with its stat effects"""
+    EFFECTS = [
+        'science',
+        'technology',
+        'engineering',
+        'math',
+        'health',
+        'intelligence',
+        'creativity',
+        'logic',
+        'social',
+        'age_increment',
+    ]
+    
+    event = models.ForeignKey(LifeEvent, on_delete=models.CASCADE, related_name='choices')
+    position = models.PositiveSmallIntegerField()  # Order shown to the player, from 0
+    text = models.CharField(max_length=200)
+    science = models.IntegerField(default=0)
+    technology = models.IntegerField(default=0)
+    engineering = models.IntegerField(default=0)
+    math = models.IntegerField(default=0)
+    health = models.IntegerField(default=0)
+    intelligence = models.IntegerField(default=0)
+    creativity = models.IntegerField(default=0)
+    logic = models.IntegerField(default=0)
+    social = models.IntegerField(default=0)
+    age_months = models.PositiveSmallIntegerField(default=0)  # How much to age after this choice
+    
+    class Meta:
+        ordering = ['event', 'position']
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'position'], name='unique_event_choice_position'),
         ]
-        
-        if self.choice3_text:
-            choices.append({
-                'text': self.choice3_text,
-                'effects': {
-                    'science': self.choice3_science,
-                    'technology': self.choice3_technology,
-                    'engineering': self.choice3_engineering,
-                    'math': self.choice3_math,
-                    'health': self.choice3_health,
-                    'intelligence': self.choice3_intelligence,
-                    'creativity': self.choice3_creativity,
-                    'logic': self.choice3_logic,
-                    'social': self.choice3_social,
-                    'age_increment': self.choice3_age_increment,
-                }
-            })
-        
-        return choices
+    
+    def __str__(self):
+        return f'{self.event.title}: {self.text}'
+    
+    @property
+    def age_increment(self):
+        """Years to age after this choice, as event definitions give it"""
+        return years(self.age_months)
+    
+    @age_increment.setter
+    def age_increment(self, value):
+        self.age_months = round(value * MONTHS_PER_YEAR)
+    
+    def get_effects(self):
+        return {effect: getattr(self, effect) for effect in self.EFFECTS}
 
 class PlayerProgress(models.Model):
     player = models.ForeignKey(Player, on_delete=models.CASCADE)
     current_event = models.ForeignKey(LifeEvent, on_delete=models.CASCADE, null=True, blank=True)
-    completed_events = models.ManyToManyField(LifeEvent, related_name='completed_by')
+    completed_events = models.ManyToManyField(LifeEvent, through='EventCompletion', related_name='completed_by')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['player'], name='unique_progress_per_player'),
+        ]
+    
     def __str__(self):
         return f'{self.player.name} - Progress'
 
+class EventCompletion(models.Model):
+    """Ledger of how many times a player has completed each event"""
+    progress = models.ForeignKey(PlayerProgress, on_delete=models.CASCADE, related_name='completions')
+    event = models.ForeignKey(LifeEvent, on_delete=models.CASCADE, related_name='completions')
+    count = models.PositiveIntegerField(default=1)
+    
+    class Meta:
+        constraints = [
+            # Also serves as the composite (progress, event) index used by
+            # the eligibility check
+            models.UniqueConstraint(fields=['progress', 'event'], name='unique_event_completion'),
+        ]
+    
+    def __str__(self):
+        return f'{self.progress} - {self.event} x{self.count}'
+    
+    @classmethod
+    def record(cls, progress, event):
+        """Count one more completion of event, atomically in the database"""
+        completions = cls.objects.filter(progress=progress, event=event)
+        if completions.update(count=F('count') + 1):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(progress=progress, event=event)
+        except IntegrityError:
+            # A concurrent request created the row first, bump it instead
+            completions.update(count=F('count') + 1)
+
+class ChoiceEventBase(models.Model):
+    """One choice a player made, or a reset when ``event`` is empty.
+
+    Rows are only ever appended. ``deltas`` holds the changes actually
+    applied to Player columns (after clamping), so summing a player's
+    entries since their last reset rebuilds their stats.
+    """
+    # Indexed together with the id, below
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, db_index=False, related_name='+')
+    # Not a constraint, so the log outlives events pruned from the catalog
+    event = models.ForeignKey(
+        LifeEvent, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, null=True, related_name='+',
+    )
+    choice_index = models.PositiveSmallIntegerField(null=True)
+    deltas = models.JSONField(default=dict)  # Player column -> change, nonzero only
+    age_months = models.PositiveIntegerField()  # Player's age once the choice was made
+    # Not auto_now_add, so archived copies keep the original time
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        abstract = True
+    
+    def __str__(self):
+        return f'{self.player_id}: {self.event_id} #{self.choice_index}'
+
+class ChoiceEvent(ChoiceEventBase):
+    """The recent part of the choice log, kept small by history.archive()"""
+    
+    class Meta:
+        indexes = [
+            # Replaying a player reads their entries in order
+            models.Index(fields=['player', 'id'], name='choiceevent_player_idx'),
+            # Archiving picks the oldest entries
+            models.Index(fields=['created_at'], name='choiceevent_created_idx'),
+        ]
+
+class ArchivedChoiceEvent(ChoiceEventBase):
+    """Choice log entries moved out of ChoiceEvent, keeping their ids"""
+    id = models.BigIntegerField(primary_key=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['player', 'id'], name='archivedchoice_player_idx'),
+        ]
+
+class CohortSummary(models.Model):
+    """Precomputed analytics over all players, one row per section.
+
+    Written only by ``analytics.refresh()``; ``fingerprint`` identifies the
+    data a row was computed from, so unchanged sections are not recomputed.
+    """
+    key = models.CharField(max_length=50, unique=True)  # e.g. 'stage:child' or 'events'
+    fingerprint = models.CharField(max_length=64)
+    data = models.JSONField(default=dict)
+    refreshed_at = models.DateTimeField()
+    
+    def __str__(self):
+        return self.key
+
+class ChangeStamp(models.Model):
+    """Version of a data set that processes keep derived copies of.
+
+    Bumped after every committed change to the data, and read by every
+    process, whatever cache backend it uses, to tell whether its copy is
+    current. ``changed_at`` is the time of the last bump.
+    """
+    key = models.CharField(max_length=50, primary_key=True)  # e.g. 'catalog' or 'questions'
+    version = models.PositiveIntegerField(default=0)
+    changed_at = models.DateTimeField(default=timezone.now)
+    
+    def __str__(self):
+        return f'{self.key} v{self.version}'
+    
+    @classmethod
+    def bump(cls, key):
+        """Move the stamp on, atomically in the database"""
+        stamps = cls.objects.filter(key=key)
+        if stamps.update(version=F('version') + 1, changed_at=timezone.now()):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(key=key, version=1)
+        except IntegrityError:
+            # A concurrent request created the row first, bump it instead
+            stamps.update(version=F('version') + 1, changed_at=timezone.now())
+
 # Keep the old Questions model for backward compatibility
 class Questions(models.Model):
     text = models.CharField(max_length=250)
@@ -0,0 +1,22 @@
+"""Custom migration operations.
+
+The migration history forks after 0003: two branches each add the same
+Questions columns, and 0020 merges them, so every database runs both sets of
+operations. Whichever branch runs second must leave those columns alone.
+"""
+from django.db import migrations
+
+
+class AddFieldIfMissing(migrations.AddField):
+    """AddField that skips the database change when the column already exists"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        connection = schema_editor.connection
+        with connection.cursor() as cursor:
+            columns = {
+                column.name
+                for column in connection.introspection.get_table_description(cursor, model._meta.db_table)
+            }
+        if model._meta.get_field(self.name).column not in columns:
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
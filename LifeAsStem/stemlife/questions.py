@@ -0,0 +1,98 @@
+"""Query parameters and paging for the /question/ endpoint.
+
+Without paging parameters the endpoint returns every matching question as a
+bare JSON list, the shape it has always had. Passing ``limit`` or ``cursor``
+asks for pages instead, ordered by id and paged with a cursor: each page ends
+with a ``next`` URL carrying the last id seen, so deep pages cost the same as
+the first one and rows added meanwhile are neither skipped nor repeated.
+Supported parameters:
+
+- ``age``, ``category``: exact-match filters
+- ``fields``: comma-separated subset of ``FIELDS`` to return (pages always
+  include ``id``)
+- ``limit``: page size, up to ``MAX_PAGE_SIZE``
+- ``cursor``: the id to continue after, as found in ``next``
+- ``format=ndjson``: every matching row, streamed one JSON object per line
+"""
+from urllib.parse import urlencode
+
+from .models import Questions
+
+FIELDS = ['text', 'age', 'category', 'answer1', 'answer2', 'answer3', 'answer4']
+FILTERS = ['age', 'category']
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Rows fetched per query when streaming a full export
+EXPORT_CHUNK_SIZE = 1000
+
+
+def cache_query(params):
+    """The parameters that shape a response, in a canonical order"""
+    return urlencode(sorted(
+        (name, value) for name, value in params.items()
+        if name in FILTERS or name in ('fields', 'limit', 'cursor', 'format')
+    ))
+
+
+def parse_fields(params):
+    """Fields to return; raises ValueError for unknown ones"""
+    if not params.get('fields'):
+        return FIELDS
+    fields = [name.strip() for name in params['fields'].split(',') if name.strip()]
+    unknown = [name for name in fields if name not in FIELDS]
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(unknown)}')
+    return fields
+
+
+def _positive_int(params, name, default):
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise ValueError(f'{name} must be an integer')
+    if value < 1:
+        raise ValueError(f'{name} must be positive')
+    return value
+
+
+def filtered(params, with_id=True):
+    """Rows matching the filters, as dicts of the requested fields"""
+    fields = parse_fields(params)
+    if with_id:
+        fields = ['id', *fields]
+    filters = {name: params[name] for name in FILTERS if name in params}
+    return Questions.objects.filter(**filters).order_by('id').values(*fields)
+
+
+def is_paged(params):
+    """Whether the client asked for pages rather than the whole list"""
+    return 'limit' in params or 'cursor' in params
+
+
+def listing(params):
+    """Every matching row, without ids, as the unpaged endpoint returns them"""
+    return list(filtered(params, with_id=False))
+
+
+def page(params):
+    """One page of the listing and the query string of the next, if any"""
+    rows = filtered(params)
+    limit = min(_positive_int(params, 'limit', PAGE_SIZE), MAX_PAGE_SIZE)
+    if params.get('cursor'):
+        rows = rows.filter(id__gt=_positive_int(params, 'cursor', 0))
+
+    # One extra row tells whether another page follows
+    rows = list(rows[:limit + 1])
+    next_query = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_params = params.copy()
+        next_params['cursor'] = rows[-1]['id']
+        next_query = next_params.urlencode()
+    return rows, next_query
+
+
+def export(params):
+    """Every matching row, fetched in chunks"""
+    return filtered(params).iterator(chunk_size=EXPORT_CHUNK_SIZE)
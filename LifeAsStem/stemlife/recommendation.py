@@ -0,0 +1,93 @@
+"""STEM field recommendations, scored for many players at once.
+
+Players are scored as rows of ``STAT_FIELDS`` values in one vectorized pass.
+The rules are those ``Player.get_stem_recommendation`` has always applied: the
+first stat rule a player passes decides the field, otherwise their strongest
+interest does, ties going to the field listed first.
+
+Each recommendation comes with a confidence margin, in stat points: how far
+the player clears the tighter threshold of the rule that matched, or how far
+their strongest interest leads the runner-up (0 on a tie).
+"""
+import functools
+import operator
+
+import numpy as np
+from django.db.models import CharField, Case, F, Q, Value, When
+
+# Player columns scored, one per row position
+STAT_FIELDS = [
+    'science_interest', 'technology_interest', 'engineering_interest', 'math_interest',
+    'health', 'intelligence', 'creativity', 'logic', 'social_skills',
+]
+
+# Recommended fields, in tie-break order, and the interest behind each
+FIELDS = ['Science', 'Technology', 'Engineering', 'Mathematics']
+INTERESTS = ['science_interest', 'technology_interest', 'engineering_interest', 'math_interest']
+
+# (field, stat, threshold, interest, threshold), first match wins; a player
+# matches when both stats are strictly above their thresholds
+RULES = [
+    ('Mathematics', 'logic', 70, 'math_interest', 60),
+    ('Science', 'creativity', 70, 'science_interest', 60),
+    ('Technology', 'intelligence', 70, 'technology_interest', 60),
+    ('Engineering', 'logic', 60, 'engineering_interest', 60),
+]
+
+
+def score(stats):
+    """Field index into FIELDS and margin for each row of ``stats``"""
+    stats = np.asarray(stats, dtype=np.int32).reshape(-1, len(STAT_FIELDS))
+    column = {field: stats[:, i] for i, field in enumerate(STAT_FIELDS)}
+
+    # Strongest interest, first one on ties, by how much it leads
+    interests = np.stack([column[name] for name in INTERESTS], axis=1)
+    fields = interests.argmax(axis=1)
+    ranked = np.sort(interests, axis=1)
+    margins = ranked[:, -1] - ranked[:, -2]
+
+    # Applied last rule first, so the first matching rule wins
+    for field, stat, stat_threshold, interest, interest_threshold in reversed(RULES):
+        clearance = np.minimum(column[stat] - stat_threshold, column[interest] - interest_threshold)
+        matches = clearance > 0
+        fields[matches] = FIELDS.index(field)
+        margins[matches] = clearance[matches]
+    return fields, margins
+
+
+def recommend(rows):
+    """``(field, margin)`` for each row of STAT_FIELDS values, in order.
+
+    ``rows`` may be a ``values_list(*STAT_FIELDS)`` queryset, a list of
+    tuples or an array.
+    """
+    stats = np.array(rows if isinstance(rows, np.ndarray) else list(rows), dtype=np.int32)
+    if not stats.size:
+        return []
+    fields, margins = score(stats)
+    return list(zip([FIELDS[field] for field in fields], margins.tolist()))
+
+
+def recommend_players(players):
+    """Map player id -> ``(field, margin)`` for a Player queryset, in one query"""
+    rows = np.array(list(players.values_list('id', *STAT_FIELDS)), dtype=np.int64)
+    if not rows.size:
+        return {}
+    return dict(zip(rows[:, 0].tolist(), recommend(rows[:, 1:])))
+
+
+def field_expression():
+    """The recommendation as a database expression over Player columns.
+
+    Lets aggregates group players by recommended field without loading them.
+    """
+    whens = [
+        When(Q(**{f'{stat}__gt': stat_threshold, f'{interest}__gt': interest_threshold}), then=Value(field))
+        for field, stat, stat_threshold, interest, interest_threshold in RULES
+    ]
+    # Strongest interest: the first one at least as strong as all later ones
+    # (every earlier one was beaten by some other interest)
+    for i, (field, interest) in enumerate(zip(FIELDS[:-1], INTERESTS)):
+        stronger = [Q(**{f'{interest}__gte': F(other)}) for other in INTERESTS[i + 1:]]
+        whens.append(When(functools.reduce(operator.and_, stronger), then=Value(field)))
+    return Case(*whens, default=Value(FIELDS[-1]), output_field=CharField())
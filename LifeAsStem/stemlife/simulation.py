@@ -0,0 +1,198 @@
+"""Headless, vectorized simulation of many lives through the event catalog.
+
+Applies the same rules as ``game.current_event`` and ``game.play_choice``,
+but to a whole population of players at once: the catalog becomes a handful
+of NumPy arrays (stages, age intervals, frequency caps, an effects matrix)
+and every loop iteration plays one turn for every life still going. Choices
+are picked uniformly at random, like a player clicking without reading.
+
+Lives end when they run out of events (a dead end, as when
+get-current-event/ answers 404) or after ``max_turns`` turns.
+"""
+import numpy as np
+
+from .game import EFFECT_FIELDS, MAX_AGING_STEPS, STAT_MAX, STAT_MIN, age_increment
+from .models import MONTHS_PER_YEAR, LifeEvent, Player
+from .recommendation import STAT_FIELDS
+from .stages import STAGE_STARTS, STAGES
+
+# Choice effect behind each simulated Player column
+FIELD_EFFECTS = {field: effect for effect, field in EFFECT_FIELDS.items()}
+
+# Selection keys keep the priority above this bit and a random tie-breaker
+# below it
+PRIORITY_STEP = 1 << 14
+
+# Lives simulated together; bounds memory to a few arrays of CHUNK_SIZE x events
+CHUNK_SIZE = 100_000
+
+
+class CatalogArrays:
+    """The event catalog as arrays indexed by event position"""
+
+    def __init__(self, events):
+        events = list(events)
+        self.keys = [event.key for event in events]
+        self.stage = np.array([STAGES.index(event.stage) for event in events], dtype=np.int8)
+        self.min_age = np.array([event.min_age for event in events], dtype=np.int32)
+        self.max_age = np.array([event.max_age for event in events], dtype=np.int32)
+        self.limit = np.array([LifeEvent.FREQUENCY_LIMITS[event.frequency] for event in events], dtype=np.uint8)
+        frequency = np.array([event.frequency for event in events])
+        # Selection priority: 'once' events first, then 'multiple' or
+        # 'common' ones; 'rare' events count towards eligibility but are
+        # never picked
+        self.priority = np.select(
+            [frequency == 'once', np.isin(frequency, ['multiple', 'common'])],
+            [2 * PRIORITY_STEP, PRIORITY_STEP], 0,
+        ).astype(np.uint16)
+
+        # Effects of choice c of event e on each stat, and the months it ages
+        choices = [event.get_choices() for event in events]
+        self.choice_count = np.array([len(c) for c in choices], dtype=np.int32)
+        width = max(self.choice_count, default=0)
+        self.effects = np.zeros((len(events), width, len(STAT_FIELDS)), dtype=np.int32)
+        self.age_steps = np.zeros((len(events), width), dtype=np.int32)
+        for e, event_choices in enumerate(choices):
+            for c, choice in enumerate(event_choices):
+                effects = choice['effects']
+                self.effects[e, c] = [effects.get(FIELD_EFFECTS[field], 0) for field in STAT_FIELDS]
+                self.age_steps[e, c] = age_increment(effects)
+
+        # Stage of each age up to one past the oldest any event covers, and
+        # which events are open at each of them (none past the oldest)
+        oldest = int(self.max_age.max(initial=0))
+        age_range = np.arange(oldest + 2)
+        self.stage_of_age = (np.searchsorted(STAGE_STARTS, age_range, side='right') - 1).astype(np.int8)
+        ages = age_range[:, None]
+        self.open_at = (
+            (self.stage_of_age[:, None] == self.stage)
+            & (self.min_age <= ages) & (self.max_age >= ages)
+        )
+        # Every age with at least one event, for jumping over gaps
+        self.ages = np.flatnonzero(self.open_at.any(axis=1))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _clip(self, ages):
+        # Ages past the catalog all behave like the row after the oldest
+        return np.minimum(ages, len(self.stage_of_age) - 1)
+
+    def stages_at(self, ages):
+        """Stage index of each age"""
+        return self.stage_of_age[self._clip(ages)]
+
+    def open_events(self, ages):
+        """Rows of the events each age falls in, regardless of completions"""
+        return self.open_at[self._clip(ages)]
+
+
+class SimulationResult:
+    """Final state of every simulated life"""
+
+    def __init__(self, lives, stat_count):
+        self.stats = np.zeros((lives, stat_count), dtype=np.int32)
+        self.age_months = np.zeros(lives, dtype=np.int32)
+        self.turns = np.zeros(lives, dtype=np.int32)
+        # Stage index where a life ran out of events, -1 if it never did
+        self.dead_end = np.full(lives, -1, dtype=np.int8)
+        self.picks = None
+
+
+def simulate(catalog, lives, max_turns=500, seed=None, chunk_size=CHUNK_SIZE):
+    """Play ``lives`` random lives through ``catalog`` (a CatalogArrays)"""
+    rng = np.random.default_rng(seed)
+    result = SimulationResult(lives, len(STAT_FIELDS))
+    result.picks = np.zeros(len(catalog), dtype=np.int64)
+    for start in range(0, lives, chunk_size):
+        end = min(start + chunk_size, lives)
+        _simulate_chunk(catalog, rng, max_turns, result, slice(start, end))
+    return result
+
+
+def _simulate_chunk(catalog, rng, max_turns, result, rows):
+    n = rows.stop - rows.start
+    initial = [Player._meta.get_field(field).default for field in STAT_FIELDS]
+    stats = np.tile(np.array(initial, dtype=np.int32), (n, 1))
+    age = np.full(n, Player._meta.get_field('age_months').default, dtype=np.int32)
+    turns = np.zeros(n, dtype=np.int32)
+    dead_end = np.full(n, -1, dtype=np.int8)
+    counts = np.zeros((n, len(catalog)), dtype=np.uint8)
+    # Events each life has not exhausted yet, updated as they are played
+    available = np.ones((n, len(catalog)), dtype=bool)
+    active = np.ones(n, dtype=bool)
+    # Random tie-breakers, drawn once: XOR-ing the pool with a fresh random
+    # value per event every turn gives each row a new uniform ordering of the
+    # events, for a fraction of the cost of drawing a whole new matrix
+    pool = _random_bits(rng, (n, len(catalog)))
+
+    for _ in range(max_turns):
+        lives = np.flatnonzero(active)
+        if not lives.size:
+            break
+        # Slicing instead of gathering avoids copies while every life is going
+        every = lives.size == n
+        subset = slice(None) if every else lives
+        eligible, found_age = _next_eligible(catalog, age[subset], available[subset])
+
+        # Prefer 'once' events, then 'multiple' or 'common' ones, picking
+        # uniformly within the preferred group: each key is the event's
+        # priority in the high bits plus random low bits
+        keys = eligible * catalog.priority
+        keys |= pool[:len(lives)] ^ _random_bits(rng, len(catalog))
+        events = keys.argmax(axis=1)
+        can_play = keys[np.arange(len(lives)), events] >= PRIORITY_STEP
+
+        if not can_play.all():
+            # A life with nothing to pick keeps its age, as the view saves nothing
+            stuck = lives[~can_play]
+            dead_end[stuck] = catalog.stages_at(age[stuck] // MONTHS_PER_YEAR)
+            active[stuck] = False
+            lives, events, found_age = lives[can_play], events[can_play], found_age[can_play]
+            subset = lives
+        choices = (rng.random(len(lives)) * catalog.choice_count[events]).astype(np.int32)
+
+        played = stats[subset] + catalog.effects[events, choices]
+        stats[subset] = np.clip(played, STAT_MIN, STAT_MAX, out=played)
+        age[subset] = found_age + catalog.age_steps[events, choices]
+        counts[lives, events] += 1
+        available[lives, events] = counts[lives, events] < catalog.limit[events]
+        turns[subset] += 1
+
+    result.stats[rows] = stats
+    result.age_months[rows] = age
+    result.turns[rows] = turns
+    result.dead_end[rows] = dead_end
+    result.picks += counts.sum(axis=0, dtype=np.int64)
+
+
+def _random_bits(rng, shape):
+    """Uniform random values below PRIORITY_STEP"""
+    size = int(np.prod(shape))
+    bits = np.frombuffer(rng.bytes(size * 2), dtype=np.uint16).reshape(shape)
+    return bits & np.uint16(PRIORITY_STEP - 1)
+
+
+def _next_eligible(catalog, months, available):
+    """Vectorized game.next_eligible_age: eligible events and the age they are at.
+
+    Events are matched on whole years; a life that skips ahead lands at the
+    start of the year it found events at, as in game.current_event.
+    """
+    age = months // MONTHS_PER_YEAR
+    eligible = catalog.open_events(age) & available
+    pending = np.flatnonzero(~eligible.any(axis=1))
+    for _ in range(MAX_AGING_STEPS - 1):
+        # Jump the lives with nothing open to the next age any event covers
+        position = np.searchsorted(catalog.ages, age[pending], side='right')
+        covered = position < len(catalog.ages)
+        pending = pending[covered]
+        if not pending.size:
+            break
+        age[pending] = catalog.ages[position[covered]]
+
+        open_events = catalog.open_events(age[pending]) & available[pending]
+        found = open_events.any(axis=1)
+        eligible[pending[found]] = open_events[found]
+        pending = pending[~found]
+    return eligible, np.maximum(age * MONTHS_PER_YEAR, months)
@@ -0,0 +1,60 @@
+"""Life stages as a table of the ages they start at.
+
+The table is built once from ``LifeEvent.STAGE_CHOICES``, whose labels give
+each stage's age range ("Child (6-12)", "Adult (30+)"), so adding or moving a
+stage there is the only change needed. Stages must be listed youngest first
+and cover every age from 0 on without gaps. Lookups are by whole years.
+"""
+import bisect
+import re
+
+from .models import LifeEvent
+
+STAGES = [stage for stage, _ in LifeEvent.STAGE_CHOICES]
+
+
+def _parse_ranges(choices):
+    """First age of each stage, checking that the ranges join up"""
+    starts = []
+    expected = 0
+    for stage, label in choices:
+        match = re.search(r'\((\d+)(?:-(\d+)|\+)\)', label)
+        if match is None:
+            raise ValueError(f'stage {stage!r} has no age range in its label')
+        first = int(match.group(1))
+        if first != expected:
+            raise ValueError(f'stage {stage!r} starts at {first}, expected {expected}')
+        starts.append(first)
+        # Only the last stage is open-ended
+        expected = int(match.group(2)) + 1 if match.group(2) else None
+    if expected is not None:
+        raise ValueError('the last stage must be open-ended')
+    return starts
+
+
+# First age of each stage, in STAGES order
+STAGE_STARTS = _parse_ranges(LifeEvent.STAGE_CHOICES)
+
+# Stage index of every age before the last stage starts, for O(1) lookups
+_STAGE_OF_AGE = [bisect.bisect_right(STAGE_STARTS, age) - 1 for age in range(STAGE_STARTS[-1])]
+
+
+def stage_index(age):
+    """Position in STAGES of the stage a player of the given age is in"""
+    if age < len(_STAGE_OF_AGE):
+        return _STAGE_OF_AGE[max(age, 0)]
+    return len(STAGES) - 1
+
+
+def stage_for_age(age):
+    """Life stage a player of the given age is in"""
+    return STAGES[stage_index(age)]
+
+
+def stage_ages(stage):
+    """``(first, last)`` ages of a stage; ``last`` is None for the last one"""
+    index = STAGES.index(stage)
+    if index + 1 < len(STAGES):
+        return STAGE_STARTS[index], STAGE_STARTS[index + 1] - 1
+    return STAGE_STARTS[index], None
+
@@ -60,9 +60,7 @@ class LifeGame {
             console.log('Response data:', data); // Debug logging
 
             if (data.error) {
-                this.showEventContent('No more events available for this stage. Try aging up!');
-                // Show a message that the game is waiting for the next stage
-                document.getElementById('eventChoices').innerHTML = '<div class="loading-state"><i class="fas fa-clock"></i> Waiting for next life stage...</div>';
+                this.showNoEvents();
                 return;
             }
 
@@ -70,16 +68,26 @@ class LifeGame {
                 throw new Error('Invalid response format - missing event or player data');
             }
 
-            this.currentEvent = data.event;
-            this.player = data.player;
-            this.updatePlayerStats();
-            this.showEventContent(data.event.description, data.event.choices, data.event.category);
+            this.showEvent(data.event, data.player);
         } catch (error) {
             console.error('Error loading event:', error);
             this.showEventContent('Error loading life event. Please try again.');
         }
     }
 
+    showEvent(event, player) {
+        this.currentEvent = event;
+        this.player = player;
+        this.updatePlayerStats();
+        this.showEventContent(event.description, event.choices, event.category);
+    }
+
+    showNoEvents() {
+        this.showEventContent('No more events available for this stage. Try aging up!');
+        // Show a message that the game is waiting for the next stage
+        document.getElementById('eventChoices').innerHTML = '<div class="loading-state"><i class="fas fa-clock"></i> Waiting for next life stage...</div>';
+    }
+
     showEventContent(description, choices = null, category = null) {
         const eventContent = document.getElementById('eventContent');
         const eventChoices = document.getElementById('eventChoices');
@@ -159,7 +167,8 @@ class LifeGame {
                     'Content-Type': 'application/json',
                     'X-CSRFToken': this.getCSRFToken()
                 },
-                body: JSON.stringify({ choice_index: choiceIndex })
+                // Ask for the next event in the same response
+                body: JSON.stringify({ choice_index: choiceIndex, advance: true })
             });
 
             const data = await response.json();
@@ -169,7 +178,7 @@ class LifeGame {
                 this.updatePlayerStats();
                 
                 // Show brief result message
-                this.showEventContent(`Choice made! You're now ${this.player.age} years old.`);
+                this.showEventContent(`Choice made! You're now ${this.formatAge()} old.`);
                 
                 // Check if STEM recommendation is available
                 if (data.stem_recommendation) {
@@ -181,13 +190,17 @@ class LifeGame {
                 
                 // Show transition message
                 setTimeout(() => {
-                    this.showEventContent(`Choice made! You're now ${this.player.age} years old.`, null, null);
+                    this.showEventContent(`Choice made! You're now ${this.formatAge()} old.`, null, null);
                     document.getElementById('eventChoices').innerHTML = '<div class="loading-state"><i class="fas fa-spinner fa-spin"></i> Loading next event...</div>';
                 }, 1000);
                 
-                // Automatically load the next event after a short delay
+                // Show the next event, which came with the response, after a short delay
                 setTimeout(() => {
-                    this.loadCurrentEvent();
+                    if (data.event) {
+                        this.showEvent(data.event, data.player);
+                    } else {
+                        this.showNoEvents();
+                    }
                 }, 2500); // 2.5 second total delay for better user experience
             } else {
                 this.showEventContent(`Error: ${data.error}`);
@@ -198,6 +211,14 @@ class LifeGame {
         }
     }
 
+    formatAge() {
+        // Ages are kept in months, so half-years show up too
+        const years = Math.floor(this.player.age_months / 12);
+        const months = this.player.age_months % 12;
+        const text = `${years} year${years === 1 ? '' : 's'}`;
+        return months ? `${text} and ${months} month${months === 1 ? '' : 's'}` : text;
+    }
+
     updatePlayerStats() {
         if (!this.player) return;
 
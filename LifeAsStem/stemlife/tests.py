@@ -1,3 +1,776 @@
-from django.test import TestCase
+import itertools
+import io
+import json
+import random
+import tempfile
+import unittest
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import analytics, history
+from .cache import CATALOG_STAMP, QUESTIONS_STAMP, catalog_version, player_key, user_key
+from .catalog import VERSION_CHECK_INTERVAL, get_catalog
+from .game import TurnError, apply_choice, completion_counts, play_choice
+from .loader import DEFAULT_CATALOG, EventLoader, parse_definition, read_definitions
+from .models import (
+    User, Player, LifeEvent, EventChoice, PlayerProgress, EventCompletion, Questions,
+    ChoiceEvent, ArchivedChoiceEvent, ChangeStamp,
+)
+from .recommendation import STAT_FIELDS, field_expression, recommend, recommend_players
+from .simulation import CatalogArrays, simulate
+from .stages import STAGES, stage_ages, stage_for_age
+
+
+_event_numbers = itertools.count()
+
+
+def create_events(count, stage='infant', frequency='common', min_age=0, max_age=2):
+    events = []
+    # Run the catalog invalidation queued for commit, as a real commit would
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        for i in range(count):
+            event = LifeEvent.objects.create(
+                key=f'test-event-{next(_event_numbers)}',
+                title=f'Event {i}',
+                description='Something happens',
+                stage=stage,
+                category='development',
+                min_age=min_age,
+                max_age=max_age,
+                frequency=frequency,
+            )
+            EventChoice.objects.create(event=event, position=0, text='Do this', science=5, age_increment=1)
+            EventChoice.objects.create(event=event, position=1, text='Do that', health=5)
+            events.append(event)
+    return events
+
+
+class GameTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('player', 'player@example.com', 'password')
+        self.player = Player.objects.create(name='Ada', creator=self.user)
+        self.player.users.add(self.user)
+        self.progress = PlayerProgress.objects.create(player=self.player)
+        self.client.force_login(self.user)
+
+    def get_event(self, cold=True):
+        if cold:
+            # Start from empty caches so runs are comparable
+            cache.clear()
+        # Warm the catalog so only per-request queries are measured
+        get_catalog()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('get_current_event'))
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def choose(self, index=0):
+        return self.client.post(reverse('make_choice'), {'choice_index': index}, content_type='application/json')
+
+    def play(self, choices):
+        return self.client.post(reverse('play_turns'), {'choices': choices}, content_type='application/json')
+
+
+class EventSelectionQueryTests(GameTestCase):
+    def test_query_count_does_not_grow_with_catalog(self):
+        events = create_events(3)
+        self.progress.completed_events.add(events[0])
+        _, small = self.get_event()
+
+        events += create_events(60)
+        self.progress.completed_events.add(*events[1:40])
+        # Drop the pending event so a new one is selected
+        PlayerProgress.objects.filter(pk=self.progress.pk).update(current_event=None)
+        _, large = self.get_event()
+
+        self.assertEqual(small, large)
+
+    @override_settings(
+        STEMLIFE_SHARED_CACHE=True, SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+    )
+    def test_polling_resolves_player_from_cache(self):
+        create_events(3)
+        self.get_event()
+
+        _, queries = self.get_event(cold=False)
+        # Only the select_related lookup: session and user come from the
+        # cache and the pending event is served again without any writes
+        self.assertEqual(queries, 1)
+
+    def test_selection_writes_only_what_changed(self):
+        create_events(3)
+        with self.assertLogs('stemlife.game', 'DEBUG') as logs:
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse('get_current_event'))
+        self.assertIn('event_selected', logs.output[0])
+
+        # The infant stage is unchanged, so only the pending event is written
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"stemlife_playerprogress"', updates[0])
+        self.assertIn('"current_event_id"', updates[0])
+
+    def test_event_payload_is_encoded_once_per_catalog(self):
+        event = create_events(1)[0]
+        catalog = get_catalog()
+        payload = catalog.payload(event)
+        self.assertIs(catalog.payload(event), payload)
+
+        data = self.get_event()[0].json()
+        self.assertEqual(data['event'], json.loads(payload))
+        self.assertEqual(data['event']['choices'], event.get_choices())
+        self.assertEqual(data['player'], self.player.serialize())
+
+        # An edit replaces the snapshot, and with it the encoded payload
+        with self.captureOnCommitCallbacks(execute=True):
+            event.title = 'Renamed'
+            event.save()
+        self.assertEqual(json.loads(get_catalog().payload(event))['title'], 'Renamed')
+        self.assertEqual(self.get_event()[0].json()['event']['title'], 'Renamed')
+
+    def test_exhausted_events_are_not_selected(self):
+        once_events = create_events(5, frequency='once')
+        self.progress.completed_events.add(*once_events[:4])
+
+        response, _ = self.get_event()
+        self.assertEqual(response.json()['event']['id'], once_events[4].id)
+
+
+class CatalogTests(TestCase):
+    def test_event_changes_reload_the_catalog_on_commit(self):
+        event = create_events(1)[0]
+        self.assertEqual(get_catalog().get(event.id).title, 'Event 0')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            event.title = 'Renamed'
+            event.save()
+            # Nothing is reloaded before the change is committed
+            self.assertEqual(get_catalog().get(event.id).title, 'Event 0')
+        self.assertEqual(get_catalog().get(event.id).title, 'Renamed')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            event.choices.get(position=1).delete()
+        self.assertEqual([choice['text'] for choice in get_catalog().get(event.id).get_choices()], ['Do this'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            event.delete()
+        self.assertIsNone(get_catalog().get(event.id))
+
+    @mock.patch('stemlife.catalog._checked_at', None)
+    def test_changes_by_other_processes_are_seen_after_the_check_interval(self):
+        clock = mock.patch('stemlife.catalog.time.monotonic')
+        now = clock.start()
+        self.addCleanup(clock.stop)
+        now.return_value = 1000
+        get_catalog()
+
+        version = catalog_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            event = LifeEvent.objects.create(key='local', title='Local', stage='infant', min_age=0, max_age=2)
+            # The shared stamp only moves once the change is committed
+            self.assertEqual(catalog_version(), version)
+        self.assertNotEqual(catalog_version(), version)
+        self.assertIsNotNone(get_catalog().get(event.id))
+
+        # Another process commits an event and bumps the stamp in the database;
+        # nothing reaches this process's cache
+        other = LifeEvent.objects.create(key='other', title='Other', stage='infant', min_age=0, max_age=2)
+        ChangeStamp.bump(CATALOG_STAMP)
+        now.return_value += 1
+        self.assertIsNone(get_catalog().get(other.id))
+        now.return_value += VERSION_CHECK_INTERVAL
+        self.assertIsNotNone(get_catalog().get(other.id))
+
+    def test_choices_come_from_their_own_table(self):
+        event = create_events(1)[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            # Any number of choices, listed by position whatever the insert order
+            for position in (4, 2, 3):
+                EventChoice.objects.create(event=event, position=position, text=f'Choice {position}', logic=position)
+
+        choices = event.get_choices()
+        self.assertEqual([choice['text'] for choice in choices], ['Do this', 'Do that', 'Choice 2', 'Choice 3', 'Choice 4'])
+        self.assertEqual(choices[0]['effects'], {
+            'science': 5, 'technology': 0, 'engineering': 0, 'math': 0, 'health': 0,
+            'intelligence': 0, 'creativity': 0, 'logic': 0, 'social': 0, 'age_increment': 1,
+        })
+        self.assertEqual(choices[4]['effects']['logic'], 4)
+
+        # The catalog prefetched every choice when it loaded
+        catalog_event = get_catalog().get(event.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(catalog_event.get_choices(), choices)
+
+    def test_eligibility_bitmaps(self):
+        toddler = create_events(1, stage='toddler', min_age=3, max_age=4, frequency='once')[0]
+        once, common = create_events(1, frequency='once') + create_events(1, min_age=1)
+        catalog = get_catalog()
+
+        self.assertEqual(catalog.events_in(catalog.mask_for('infant', 0)), [once])
+        self.assertEqual(catalog.events_in(catalog.mask_for('infant', 2)), [once, common])
+        self.assertEqual(catalog.events_in(catalog.mask_for('toddler', 3)), [toddler])
+        self.assertEqual(catalog.mask_for('infant', 3), 0)
+        self.assertEqual(catalog.events_in(catalog.frequency_mask('once')), [toddler, once])
+
+        # 'once' events are used up after one completion, 'common' after five
+        exhausted = catalog.exhausted_mask({once.id: 1, common.id: 4})
+        self.assertEqual(catalog.events_in(exhausted), [once])
+        eligible = catalog.mask_for('infant', 2) & ~exhausted
+        self.assertEqual(catalog.random_event(eligible), common)
+        self.assertIsNone(catalog.random_event(catalog.mask_for('infant', 0) & ~exhausted))
+
+
+class ChoiceTests(GameTestCase):
+    def test_effects_are_clamped_to_the_stat_range(self):
+        Player.objects.filter(pk=self.player.pk).update(intelligence=95, creativity=3)
+        apply_choice(self.player, {'intelligence': 10, 'creativity': -10})
+
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.intelligence, 100)
+        self.assertEqual(self.player.creativity, 0)
+
+    def test_choice_is_applied_once(self):
+        event = create_events(1)[0]
+        self.get_event()
+        self.assertTrue(self.choose().json()['success'])
+        self.assertEqual(self.choose().json(), {'error': 'No current event'})
+
+        # A request that loaded the progress before the first choice landed
+        stale = PlayerProgress.objects.get(pk=self.progress.pk)
+        stale.current_event = event
+        with self.assertRaisesMessage(TurnError, 'No current event'):
+            play_choice(self.player, stale, event, 0)
+
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.science_interest, 5)
+        self.assertEqual(self.progress.completions.get().count, 1)
+
+
+class PageTests(GameTestCase):
+    def test_missing_progress_is_created_for_page_views(self):
+        self.progress.delete()
+        for url in (reverse('index'), reverse('game')):
+            response = self.client.get(url)
+            self.assertTemplateUsed(response, 'stemlife/game.html')
+            self.assertEqual(response.context['player'], self.player)
+
+        self.assertEqual(Player.objects.filter(users=self.user).count(), 1)
+        self.assertEqual(PlayerProgress.objects.filter(player=self.player).count(), 1)
+
+    def test_users_without_a_player_create_one(self):
+        other = User.objects.create_user('other', 'other@example.com', 'password')
+        self.client.force_login(other)
+        self.assertRedirects(self.client.get(reverse('game')), reverse('create_character'))
+        self.assertFalse(PlayerProgress.objects.filter(player__users=other).exists())
+
+
+class AccessPathTests(GameTestCase):
+    def test_one_progress_row_per_player(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            PlayerProgress.objects.create(player=self.player)
+
+    @unittest.skipUnless(connection.vendor == 'sqlite', 'plans are checked on SQLite')
+    def test_hot_queries_use_their_indexes(self):
+        out = io.StringIO()
+        call_command('explain_queries', stdout=out)
+        plans = out.getvalue()
+        self.assertIn('USING COVERING INDEX player_users_user_player_idx', plans)
+        # The listing is the one get_questions runs, filters included
+        self.assertIn('WHERE "stemlife_questions"."category" = math', plans)
+
+    def test_users_are_not_cached_without_a_shared_cache(self):
+        create_events(1)
+        self.get_event()
+        self.assertIsNone(cache.get(user_key(self.user.pk)))
+        self.assertIsNone(cache.get(player_key(self.user.pk)))
+
+    @override_settings(STEMLIFE_SHARED_CACHE=True)
+    def test_only_the_session_hash_is_cached(self):
+        create_events(1)
+        self.get_event()
+        self.assertEqual(cache.get(user_key(self.user.pk)), self.user.get_session_auth_hash())
+        self.get_event(cold=False)
+
+        # A password change drops the entry and ends the session
+        self.user.set_password('changed')
+        self.user.save()
+        response = self.client.get(reverse('get_current_event'))
+        self.assertNotEqual(response.status_code, 200)
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+
+class ConditionalGetTests(GameTestCase):
+    def test_unchanged_state_is_not_modified(self):
+        create_events(3)
+        response, _ = self.get_event()
+        etag = response['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('get_current_event'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse([q for q in queries if q['sql'].startswith('UPDATE')])
+
+        self.choose()
+        response = self.client.get(reverse('get_current_event'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_recommendation_etag_follows_choices_and_resets(self):
+        create_events(3)
+        url = reverse('get_stem_recommendation')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.get_event()
+        self.choose()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        self.client.get(reverse('reset_game'))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class AdvanceTests(GameTestCase):
+    def test_choice_returns_the_next_event(self):
+        events = create_events(2, frequency='once')
+        first = self.get_event()[0].json()['event']['id']
+
+        response = self.client.post(
+            reverse('make_choice'), {'choice_index': 0, 'advance': True}, content_type='application/json'
+        )
+        data = response.json()
+        self.assertTrue(data['success'])
+        self.assertEqual({first, data['event']['id']}, {event.id for event in events})
+        self.progress.refresh_from_db()
+        self.assertEqual(self.progress.current_event_id, data['event']['id'])
+
+        # The pending event is what get-current-event/ serves next
+        self.assertEqual(self.get_event(cold=False)[0].json()['event']['id'], data['event']['id'])
+
+        response = self.client.post(
+            reverse('make_choice'), {'choice_index': 0, 'advance': True}, content_type='application/json'
+        )
+        self.assertIsNone(response.json()['event'])
+
+
+class PlayTurnsTests(GameTestCase):
+    def test_choices_are_played_in_order(self):
+        events = create_events(3, frequency='once')
+        response = self.play([0, 1, 0])
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+
+        played = [turn['event']['id'] for turn in data['turns']]
+        self.assertCountEqual(played, [event.id for event in events])
+        self.assertEqual([turn['choice_index'] for turn in data['turns']], [0, 1, 0])
+        self.assertIsNone(data['event'])
+        # Two choices add 5 science each, one adds 5 health (capped at 100)
+        self.assertEqual(data['player']['science_interest'], 10)
+        self.assertEqual(self.progress.completions.count(), 3)
+
+    def test_invalid_choice_rolls_back_the_batch(self):
+        create_events(3, frequency='once')
+        response = self.play([0, 5])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['turn'], 1)
+
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.science_interest, 0)
+        self.assertFalse(self.progress.completions.exists())
+
+
+class ChoiceLogTests(GameTestCase):
+    def assertReplayMatchesPlayer(self):
+        self.player.refresh_from_db()
+        state = history.replay(self.player.id)
+        self.assertEqual(state, {field: getattr(self.player, field) for field in history.REPLAYED_FIELDS})
+
+    def test_batch_is_logged_in_one_insert_and_replays(self):
+        create_events(4, frequency='once')
+        with CaptureQueriesContext(connection) as queries:
+            self.play([0, 1, 0])
+        inserts = [q for q in queries if q['sql'].startswith('INSERT INTO "stemlife_choiceevent"')]
+        self.assertEqual(len(inserts), 1)
+
+        entries = list(ChoiceEvent.objects.order_by('id'))
+        self.assertEqual([entry.choice_index for entry in entries], [0, 1, 0])
+        self.assertEqual(entries[0].deltas, {'science_interest': 5})
+        # Health starts at the cap, so the second choice changed nothing
+        self.assertEqual(entries[1].deltas, {})
+        self.assertReplayMatchesPlayer()
+
+        self.client.post(reverse('reset_game'))
+        self.play([0])
+        self.assertReplayMatchesPlayer()
+
+    def test_deltas_are_taken_from_the_stored_stats(self):
+        event = create_events(1)[0]
+        self.get_event()
+        # Changed behind the back of the in-memory player
+        Player.objects.filter(pk=self.player.pk).update(science_interest=97)
+        with transaction.atomic():
+            play_choice(self.player, self.progress, event, 0)
+
+        self.assertEqual(ChoiceEvent.objects.get().deltas, {'science_interest': 3})
+        self.assertEqual(self.player.science_interest, 100)
+
+    def test_reset_writes_only_what_it_resets(self):
+        create_events(1)
+        self.play([0])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(reverse('reset_game'))
+        update = next(q['sql'] for q in queries if q['sql'].startswith('UPDATE "stemlife_player"'))
+        self.assertIn('"state_version"', update)
+        self.assertNotIn('"name"', update)
+        self.assertNotIn('"creator_id"', update)
+
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.state_version, 2)
+        self.assertEqual(self.player.science_interest, 0)
+        self.assertReplayMatchesPlayer()
+
+    def test_archived_entries_still_replay(self):
+        create_events(3, frequency='once')
+        self.play([0, 0])
+        ChoiceEvent.objects.update(created_at=timezone.now() - timedelta(days=100))
+        self.play([0])
+
+        self.assertEqual(history.archive(), 2)
+        self.assertEqual(ChoiceEvent.objects.count(), 1)
+        self.assertEqual(ArchivedChoiceEvent.objects.count(), 2)
+        self.assertReplayMatchesPlayer()
+
+    def test_choice_counts_are_refreshed_incrementally(self):
+        events = create_events(2, frequency='once')
+        self.play([0])
+        analytics.refresh()
+        self.play([1])
+        with CaptureQueriesContext(connection) as queries:
+            self.assertIn('choices', analytics.refresh())
+        # Only the entries after the previous refresh are read
+        self.assertFalse([q for q in queries if 'stemlife_archivedchoiceevent' in q['sql']])
+
+        counts = {event['key']: event['choices'] for event in analytics.summary()['choices']}
+        self.assertEqual(sorted(counts), sorted(event.key for event in events))
+        self.assertEqual(sorted(counts.values(), key=list), [{'0': 1}, {'1': 1}])
+
+
+class EventCompletionTests(GameTestCase):
+    def test_record_counts_every_completion(self):
+        event = create_events(1)[0]
+        for _ in range(3):
+            EventCompletion.record(self.progress, event)
+
+        completion = EventCompletion.objects.get(progress=self.progress, event=event)
+        self.assertEqual(completion.count, 3)
+
+    def test_common_event_is_capped_after_five_completions(self):
+        common, multiple = create_events(1) + create_events(1, frequency='multiple')
+        for _ in range(5):
+            EventCompletion.record(self.progress, common)
+
+        response, _ = self.get_event()
+        self.assertEqual(response.json()['event']['id'], multiple.id)
+
+    def test_counts_cached_before_another_process_played_are_ignored(self):
+        event = create_events(1)[0]
+        self.assertEqual(completion_counts(self.player, self.progress), {})
+
+        # Another process records a completion and bumps state_version; its
+        # cache deletion never reaches this process
+        EventCompletion.objects.bulk_create([EventCompletion(progress=self.progress, event=event, count=1)])
+        Player.objects.filter(pk=self.player.pk).update(state_version=self.player.state_version + 1)
+        self.player.refresh_from_db()
+        self.assertEqual(completion_counts(self.player, self.progress), {event.id: 1})
+
+
+class AgingTests(GameTestCase):
+    def test_player_skips_straight_to_next_age_with_events(self):
+        event = create_events(1, stage='child', min_age=10, max_age=12)[0]
+
+        response, _ = self.get_event()
+        self.assertEqual(response.json()['event']['id'], event.id)
+        self.player.refresh_from_db()
+        self.assertEqual(self.player.age, 10)
+        self.assertEqual(self.player.current_stage, 'child')
+
+    def test_half_year_increments_add_up(self):
+        create_events(2, frequency='once')
+        # Neither second choice sets an increment, so each ages half a year
+        response = self.play([1])
+        self.assertEqual(response.json()['player']['age_months'], 6)
+        self.assertEqual(response.json()['player']['age'], 0)
+
+        response = self.play([1])
+        self.assertEqual(response.json()['player']['age_months'], 12)
+        self.assertEqual(response.json()['player']['age'], 1)
+
+    def test_stage_table_matches_stage_labels(self):
+        self.assertEqual(
+            [stage_for_age(age) for age in (0, 2, 3, 12, 13, 29, 30, 99)],
+            ['infant', 'infant', 'toddler', 'child', 'teen', 'young_adult', 'adult', 'adult'],
+        )
+        self.assertEqual(stage_ages('child'), (6, 12))
+        self.assertEqual(stage_ages(STAGES[-1]), (30, None))
+
+    def test_ages_outside_an_events_stage_are_not_indexed(self):
+        # A child event listed until 15 can only show up until 12, when the
+        # child stage ends, so aging jumps from 12 straight to the teen event
+        create_events(1, stage='child', min_age=10, max_age=15)
+        create_events(1, stage='teen', min_age=17, max_age=18)
+        catalog = get_catalog()
+        self.assertEqual(catalog.ages, [10, 11, 12, 17, 18])
+        self.assertEqual(catalog.next_age(12), 17)
+
+    def test_running_out_of_events_does_not_recurse(self):
+        event = create_events(1, frequency='once')[0]
+        self.progress.completed_events.add(event)
+
+        response = self.client.get(reverse('get_current_event'))
+        self.assertEqual(response.status_code, 404)
+
+
+def event_definition(title, stage='infant', **overrides):
+    definition = {
+        'title': title,
+        'description': 'Something happens',
+        'stage': stage, 'category': 'development', 'min_age': 0, 'max_age': 2, 'frequency': 'once',
+        'choices': [
+            {'text': 'Do this', 'science': 5, 'age_increment': 1},
+            {'text': 'Do that', 'health': 5},
+        ],
+    }
+    definition.update(overrides)
+    return definition
+
+
+def load_definitions(definitions, **options):
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        return EventLoader(**options).load(parse_definition(definition) for definition in definitions)
+
+
+class EventLoaderTests(TestCase):
+    def test_reload_keeps_ids_and_writes_only_changes(self):
+        definitions = [event_definition('Crawling'), event_definition('Babbling')]
+        result = load_definitions(definitions)
+        self.assertEqual(result.created, ['infant-crawling', 'infant-babbling'])
+        crawling = LifeEvent.objects.get(key='infant-crawling')
+        self.assertEqual([choice['text'] for choice in crawling.get_choices()], ['Do this', 'Do that'])
+
+        definitions[0]['choices'][1]['text'] = 'Do something else'
+        result = load_definitions(definitions)
+        self.assertEqual(result.updated, ['infant-crawling'])
+        self.assertEqual(result.unchanged, 1)
+        self.assertEqual(LifeEvent.objects.get(key='infant-crawling').id, crawling.id)
+        self.assertEqual(crawling.choices.get(position=1).text, 'Do something else')
+
+        with CaptureQueriesContext(connection) as queries:
+            result = load_definitions(definitions)
+        self.assertFalse(result.changed)
+        self.assertFalse([q for q in queries if not q['sql'].startswith(('SELECT', 'SAVEPOINT', 'RELEASE'))])
+
+    def test_dry_run_writes_nothing(self):
+        result = load_definitions([event_definition('Crawling')], dry_run=True)
+        self.assertEqual(result.created, ['infant-crawling'])
+        self.assertFalse(LifeEvent.objects.exists())
+
+    def test_repeated_titles_get_numbered_keys(self):
+        load_definitions([event_definition('Crawling'), event_definition('Crawling')], batch_size=1)
+        self.assertEqual(
+            sorted(LifeEvent.objects.values_list('key', flat=True)),
+            ['infant-crawling', 'infant-crawling-2'],
+        )
+
+    def test_missing_events_are_kept_unless_pruned(self):
+        load_definitions([event_definition('Crawling'), event_definition('Babbling')])
+        result = load_definitions([event_definition('Crawling')])
+        self.assertEqual(result.missing, ['infant-babbling'])
+        self.assertEqual(LifeEvent.objects.count(), 2)
+
+        load_definitions([event_definition('Crawling')], prune=True)
+        self.assertEqual(list(LifeEvent.objects.values_list('key', flat=True)), ['infant-crawling'])
+
+    def test_invalid_records_report_their_line(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl') as f:
+            f.write(json.dumps(event_definition('Crawling')) + '\n')
+            f.write(json.dumps(event_definition('Babbling', stage='toddler-ish')) + '\n')
+            f.flush()
+            with self.assertRaisesMessage(ValueError, "line 2: unknown stage: 'toddler-ish'"):
+                EventLoader().load(read_definitions(f.name))
+        self.assertFalse(LifeEvent.objects.exists())
+
+    def test_bundled_catalog_is_valid(self):
+        result = EventLoader(dry_run=True).load(read_definitions(DEFAULT_CATALOG))
+        self.assertTrue(result.created)
+
+
+class SimulationTests(TestCase):
+    def test_lives_follow_the_game_rules(self):
+        # Choices that do not age the player, so every infant event is played
+        # up to its cap before skipping ahead to the child event at age 8
+        stay = [{'text': 'Do this', 'science': 5}, {'text': 'Do that', 'health': 5}]
+        load_definitions([
+            event_definition('Crawling', choices=stay),
+            event_definition('Babbling', frequency='common', choices=stay),
+            event_definition('Reading', stage='child', min_age=8, max_age=9),
+        ])
+        catalog = CatalogArrays(get_catalog().events.values())
+        result = simulate(catalog, 200, seed=1, chunk_size=64)
+
+        self.assertEqual(list(result.picks), [200, 1000, 200])
+        self.assertEqual(set(result.turns), {7})
+        self.assertEqual(set(result.dead_end), {STAGES.index('child')})
+        self.assertTrue((result.age_months >= 8 * 12).all())
+        self.assertEqual(set(result.stats[:, STAT_FIELDS.index('science_interest')] % 5), {0})
+
+
+class RecommendationTests(TestCase):
+    def test_rules_and_margins(self):
+        rows = [
+            # Creativity and science clear their rule by 10 and 5
+            [65, 20, 20, 65, 50, 50, 80, 50, 50],
+            # Both the Mathematics and Science rules match; the first wins
+            [65, 20, 20, 65, 50, 50, 80, 80, 50],
+            # No rule: Technology and Engineering tie for strongest interest
+            [10, 30, 30, 10, 50, 80, 50, 75, 50],
+            # No rule: Mathematics leads Engineering by 5
+            [20, 20, 40, 45, 50, 50, 50, 50, 50],
+        ]
+        self.assertEqual(
+            recommend(rows),
+            [('Science', 5), ('Mathematics', 5), ('Technology', 0), ('Mathematics', 5)],
+        )
+
+    def test_players_are_scored_in_one_query(self):
+        user = User.objects.create_user('teacher', 'teacher@example.com', 'password')
+        ada = Player.objects.create(name='Ada', creator=user, logic=80, math_interest=70)
+        grace = Player.objects.create(name='Grace', creator=user, technology_interest=20)
+
+        with self.assertNumQueries(1):
+            recommendations = recommend_players(Player.objects.all())
+        self.assertEqual(recommendations, {ada.id: ('Mathematics', 10), grace.id: ('Technology', 20)})
+        self.assertEqual(ada.get_stem_recommendation(), 'Mathematics')
+        self.assertEqual(recommend_players(Player.objects.none()), {})
+
+    def test_database_expression_agrees(self):
+        user = User.objects.create_user('teacher', 'teacher@example.com', 'password')
+        rng = random.Random(0)
+        for i in range(200):
+            # Stats on both sides of every threshold, with plenty of ties
+            stats = [rng.choice([0, 60, 61, 70, 71]) for _ in STAT_FIELDS]
+            Player.objects.create(name=f'Player {i}', creator=user, **dict(zip(STAT_FIELDS, stats)))
+
+        expected = {player_id: field for player_id, (field, _) in recommend_players(Player.objects.all()).items()}
+        annotated = dict(Player.objects.annotate(field=field_expression()).values_list('id', 'field'))
+        self.assertEqual(annotated, expected)
+
+
+class AnalyticsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('teacher', 'teacher@example.com', 'password', is_staff=True)
+        self.players = [
+            Player.objects.create(name=f'Player {i}', creator=self.user, current_stage='teen', logic=40 + 10 * i)
+            for i in range(5)
+        ]
+        Player.objects.create(name='Ada', creator=self.user, current_stage='child', math_interest=5)
+
+    def test_refresh_recomputes_only_changed_sections(self):
+        changed = analytics.refresh()
+        self.assertIn('stage:teen', changed)
+        teen = analytics.summary()['stages'][STAGES.index('teen')]
+        self.assertEqual(teen['players'], 5)
+        self.assertEqual(teen['recommendations']['Science'], 5)
+        self.assertEqual(teen['stats']['logic'], {'10': 40, '25': 50, '50': 60, '75': 70, '90': 80})
+
+        self.assertEqual(analytics.refresh(), [])
+        apply_choice(self.players[0], {'math': 100})
+        self.assertEqual(analytics.refresh(), ['stage:teen'])
+        teen = analytics.summary()['stages'][STAGES.index('teen')]
+        self.assertEqual(teen['recommendations'], {'Science': 4, 'Technology': 0, 'Engineering': 0, 'Mathematics': 1})
+
+    def test_endpoint_serves_the_summary_to_staff(self):
+        analytics.refresh()
+        self.client.force_login(self.user)
+        with self.assertNumQueries(1):
+            analytics.summary()
+        data = self.client.get(reverse('analytics')).json()
+        self.assertEqual([stage['players'] for stage in data['stages']], [0, 0, 1, 5, 0, 0])
+
+        User.objects.filter(pk=self.user.pk).update(is_staff=False)
+        cache.clear()
+        self.assertEqual(self.client.get(reverse('analytics')).status_code, 403)
+
+
+class QuestionListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(5):
+            Questions.objects.create(
+                text=f'Question {i}', age='10' if i % 2 else '12', category='math',
+                answer1='Yes', answer2='No',
+            )
+
+    def test_cursor_pages_cover_every_row_once(self):
+        seen = []
+        url = reverse('question') + '?limit=2'
+        while url:
+            data = self.client.get(url).json()
+            seen += [row['id'] for row in data['questions']]
+            url = data['next']
+        self.assertEqual(seen, list(Questions.objects.order_by('id').values_list('id', flat=True)))
+
+    def test_default_response_is_the_whole_list(self):
+        data = self.client.get(reverse('question')).json()
+        self.assertEqual(data, [question.serialize() for question in Questions.objects.order_by('id')])
+
+    def test_filters_and_fields(self):
+        data = self.client.get(reverse('question'), {'age': '10', 'fields': 'text'}).json()
+        self.assertEqual(data, [{'text': 'Question 1'}, {'text': 'Question 3'}])
+
+        data = self.client.get(reverse('question'), {'age': '10', 'fields': 'text', 'limit': 10}).json()
+        self.assertEqual(set(data['questions'][0]), {'id', 'text'})
+        self.assertIsNone(data['next'])
+
+        response = self.client.get(reverse('question'), {'fields': 'password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_ndjson_export_streams_every_row(self):
+        response = self.client.get(reverse('question'), {'format': 'ndjson', 'limit': 1})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['text'] for line in lines], [f'Question {i}' for i in range(5)])
+
+    def test_unchanged_listing_is_not_modified(self):
+        response = self.client.get(reverse('question'))
+        etag = response['ETag']
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        response = self.client.get(reverse('question'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Questions.objects.create(text='New', age='10', category='math')
+        response = self.client.get(reverse('question'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 6)
+
+    def test_changes_by_other_processes_move_the_etag(self):
+        response = self.client.get(reverse('question'))
+        etag = response['ETag']
+
+        # Another process changes the bank and bumps the stamp in the
+        # database; the page cached here is left alone
+        Questions.objects.filter(text='Question 0').update(text='Changed')
+        ChangeStamp.bump(QUESTIONS_STAMP)
+        response = self.client.get(reverse('question'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['text'], 'Changed')
@@ -12,8 +12,10 @@ urlpatterns = [
     path('game/', views.game_view, name='game'),
     path('get-current-event/', views.get_current_event, name='get_current_event'),
     path('make-choice/', views.make_choice, name='make_choice'),
+    path('play-turns/', views.play_turns, name='play_turns'),
     path('get-stem-recommendation/', views.get_stem_recommendation, name='get_stem_recommendation'),
     path('reset-game/', views.reset_game, name='reset_game'),
+    path('analytics/', views.get_analytics, name='analytics'),
 
     # Data
     path("question/", views.get_questions, name='question')
@@ -1,25 +1,32 @@
 from django.shortcuts import render
-from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
-from django.db import IntegrityError
+from django.http import HttpResponse, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
+from django.db import IntegrityError, transaction
 from django.urls import reverse
-from .models import User, Questions, Player, LifeEvent, PlayerProgress
+from .models import User, Player, PlayerProgress
+from . import analytics, cache, questions
+from .catalog import get_catalog
+from .decorators import load_player, player_required
+from .game import MAX_BATCH_TURNS, TurnError, completion_counts, current_event, flush_log, log_reset, play_choice
+from .stages import stage_for_age
 from django.contrib.auth import authenticate, login, logout
 from django.core import serializers
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache as django_cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.views.decorators.http import condition
 import json
-import random
-from django.db.models import Q
+from django.db.models import F, Q
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+import zlib
 
 # Create your views here.
 
 def index(request):
     if request.user.is_authenticated:
         # Check if user has a player profile
-        try:
-            player = Player.objects.get(users=request.user)
-            return render(request, "stemlife/game.html", {"player": player})
-        except Player.DoesNotExist:
-            return render(request, "stemlife/create_character.html")
+        if load_player(request, create_progress=True):
+            return render(request, "stemlife/game.html", {"player": request.player})
+        return render(request, "stemlife/create_character.html")
     return render(request, "stemlife/index.html")
 
 @login_required
@@ -41,191 +48,92 @@ def create_character(request):
 
 @login_required
 def game_view(request):
-    try:
-        player = Player.objects.get(users=request.user)
-        return render(request, "stemlife/game.html", {"player": player})
-    except Player.DoesNotExist:
-        return HttpResponseRedirect(reverse("create_character"))
+    if load_player(request, create_progress=True):
+        return render(request, "stemlife/game.html", {"player": request.player})
+    return HttpResponseRedirect(reverse("create_character"))
+
+def event_response(event_payload, player):
+    """JSON response for an event, splicing in its pre-encoded payload"""
+    content = b''.join([
+        b'{"event": ', event_payload,
+        b', "player": ', json.dumps(player.serialize()).encode(),
+        b'}',
+    ])
+    return HttpResponse(content, content_type="application/json")
+
+def with_event(data, event_payload):
+    """JSON response for ``data`` plus an "event" member spliced in pre-encoded"""
+    content = b''.join([
+        json.dumps(data).encode()[:-1],
+        b', "event": ', event_payload if event_payload is not None else b'null',
+        b'}',
+    ])
+    return HttpResponse(content, content_type="application/json")
+
+def player_etag(player, *parts):
+    """ETag for a view of the player's state, which moves with state_version"""
+    return quote_etag('-'.join(str(part) for part in (player.id, player.state_version) + parts))
+
+def state_response(request, etag, build_response):
+    """304 if the client is up to date, else the built response, with the ETag"""
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = build_response()
+    response['ETag'] = etag
+    # Browsers may keep the response but must revalidate it on every poll
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
 
 @login_required
+@player_required
 def get_current_event(request):
     """Get the current life event for the player"""
-    try:
-        player = Player.objects.get(users=request.user)
-        progress = PlayerProgress.objects.get(player=player)
-        
-        # Get current stage based on age
-        if player.age < 3:
-            stage = "infant"
-        elif player.age < 6:
-            stage = "toddler"
-        elif player.age < 13:
-            stage = "child"
-        elif player.age < 20:
-            stage = "teen"
-        elif player.age < 30:
-            stage = "young_adult"
-        else:
-            stage = "adult"
-        
-        player.current_stage = stage
-        player.save()
-        
-        print(f"Debug: Player age: {player.age}, Stage: {stage}")  # Debug logging
-        
-        # Get available events for current stage and age range
-        available_events = LifeEvent.objects.filter(
-            stage=stage,
-            min_age__lte=player.age,
-            max_age__gte=player.age
-        )
-        
-        print(f"Debug: Found {available_events.count()} available events")  # Debug logging
-        
-        if available_events.exists():
-            # Filter out events that have been completed too many times
-            filtered_events = []
-            
-            for event in available_events:
-                # Check how many times this event has been completed
-                completed_count = progress.completed_events.filter(id=event.id).count()
-                
-                # Allow events based on frequency
-                if event.frequency == 'once' and completed_count >= 1:
-                    continue  # Skip once events that are already completed
-                elif event.frequency == 'rare' and completed_count >= 1:
-                    continue  # Skip rare events that are already completed
-                elif event.frequency == 'multiple' and completed_count >= 3:
-                    continue  # Skip multiple events that have been done 3+ times
-                elif event.frequency == 'common' and completed_count >= 5:
-                    continue  # Skip common events that have been done 5+ times
-                
-                # If we get here, the event is available
-                filtered_events.append(event)
-            
-            if filtered_events:
-                # Prioritize 'once' events if available and not completed
-                once_events = [e for e in filtered_events if e.frequency == 'once']
-                if once_events:
-                    event = random.choice(once_events)
-                else:
-                    # If no 'once' events, get 'multiple' or 'common' events
-                    other_events = [e for e in filtered_events if e.frequency in ['multiple', 'common']]
-                    if other_events:
-                        event = random.choice(other_events)
-                    else:
-                        # Fallback if no events are found for the current stage
-                        return JsonResponse({'error': 'No events available for this stage.'}, status=404)
-                
-                progress.current_event = event
-                progress.save()
-                
-                return JsonResponse({
-                    "event": {
-                        "id": event.id,
-                        "title": event.title,
-                        "description": event.description,
-                        "choices": event.get_choices(),
-                        "category": event.category
-                    },
-                    "player": {
-                        "age": player.age,
-                        "health": player.health,
-                        "intelligence": player.intelligence,
-                        "creativity": player.creativity,
-                        "logic": player.logic,
-                        "social_skills": player.social_skills,
-                        "science_interest": player.science_interest,
-                        "technology_interest": player.technology_interest,
-                        "engineering_interest": player.engineering_interest,
-                        "math_interest": player.math_interest
-                    }
-                })
-            else:
-                # All events for this stage/age completed, age up naturally
-                player.age += 1
-                player.save()
-                
-                # Try to get events for the new age
-                return get_current_event(request)
-        else:
-            # No events available for current stage, age up to next stage
-            if stage == "infant" and player.age >= 2:
-                player.age = 3  # Move to toddler stage
-            elif stage == "toddler" and player.age >= 5:
-                player.age = 6  # Move to child stage
-            elif stage == "child" and player.age >= 12:
-                player.age = 13  # Move to teen stage
-            elif stage == "teen" and player.age >= 19:
-                player.age = 20  # Move to young adult stage
-            elif stage == "young_adult" and player.age >= 29:
-                player.age = 30  # Move to adult stage
-            else:
-                player.age += 1  # Default aging
-            
-            player.save()
-            
-            # Try to get events for the new age
-            return get_current_event(request)
-            
-    except (Player.DoesNotExist, PlayerProgress.DoesNotExist):
-        return JsonResponse({"error": "Player not found"}, status=404)
+    player = request.player
+    progress = request.progress
+    catalog = get_catalog()
+    
+    event = current_event(player, progress, catalog)
+    if event is None:
+        # Fallback if no events are left for the player
+        return JsonResponse({'error': 'No events available for this stage.'}, status=404)
+    
+    # The payload checksum covers edits to the event itself
+    payload = catalog.payload(event)
+    etag = player_etag(player, event.id, zlib.crc32(payload))
+    return state_response(request, etag, lambda: event_response(payload, player))
 
 @login_required
+@player_required
 def make_choice(request):
-    """Process player choice and update stats"""
+    """Process player choice and update stats.
+
+    With ``"advance": true`` the next event is selected in the same
+    transaction and returned as ``event``, saving a get-current-event/ call.
+    """
     if request.method == "POST":
         try:
             data = json.loads(request.body)
             choice_index = data.get("choice_index")
+            # Opt in to getting the next event back instead of polling for it
+            advance = data.get("advance") is True
             
-            player = Player.objects.get(users=request.user)
-            progress = PlayerProgress.objects.get(player=player)
+            player = request.player
+            progress = request.progress
             
-            if not progress.current_event:
+            if not progress.current_event_id:
                 return JsonResponse({"error": "No current event"})
             
-            event = progress.current_event
-            choices = event.get_choices()
-            
-            if choice_index >= len(choices):
-                return JsonResponse({"error": "Invalid choice"})
-            
-            choice = choices[choice_index]
-            effects = choice["effects"]
-            
-            # Apply effects to player
-            player.science_interest += effects.get("science", 0)
-            player.technology_interest += effects.get("technology", 0)
-            player.engineering_interest += effects.get("engineering", 0)
-            player.math_interest += effects.get("math", 0)
-            player.health += effects.get("health", 0)
-            player.intelligence += effects.get("intelligence", 0)
-            player.creativity += effects.get("creativity", 0)
-            player.logic += effects.get("logic", 0)
-            player.social_skills += effects.get("social", 0)
-            
-            # Age the player based on choice (not always by 1)
-            age_increment = effects.get("age_increment", 0)
-            if age_increment > 0:
-                player.age += age_increment
-            else:
-                # Always age a little bit (0.5 years) even if no specific increment
-                player.age += 0.5
-            
-            # Ensure stats stay within reasonable bounds
-            for attr in ['health', 'intelligence', 'creativity', 'logic', 'social_skills']:
-                setattr(player, attr, max(0, min(100, getattr(player, attr))))
+            # The catalog copy of the event has its choices prefetched
+            catalog = get_catalog()
+            event = catalog.get(progress.current_event_id) or progress.current_event
             
-            for attr in ['science_interest', 'technology_interest', 'engineering_interest', 'math_interest']:
-                setattr(player, attr, max(0, min(100, getattr(player, attr))))
-            
-            player.save()
-            
-            # Mark event as completed
-            progress.completed_events.add(event)
-            progress.current_event = None
-            progress.save()
+            with transaction.atomic():
+                # The cached counts are only dropped on commit, so keep a
+                # copy in step for picking the next event
+                counts = dict(completion_counts(player, progress)) if advance else None
+                play_choice(player, progress, event, choice_index, counts)
+                next_event = current_event(player, progress, catalog, counts) if advance else None
+                cache.invalidate_player(player.id, progress.id)
             
             # Check if player should get STEM recommendation
             stem_recommendation = None
@@ -234,24 +142,16 @@ def make_choice(request):
             
             response_data = {
                 "success": True,
-                "player": {
-                    "age": player.age,
-                    "health": player.health,
-                    "intelligence": player.intelligence,
-                    "creativity": player.creativity,
-                    "logic": player.logic,
-                    "social_skills": player.social_skills,
-                    "science_interest": player.science_interest,
-                    "technology_interest": player.technology_interest,
-                    "engineering_interest": player.engineering_interest,
-                    "math_interest": player.math_interest
-                },
+                "player": player.serialize(),
                 "stem_recommendation": stem_recommendation
             }
+            if advance:
+                # null once the player has run out of events
+                return with_event(response_data, next_event and catalog.payload(next_event))
             return JsonResponse(response_data)
             
-        except (Player.DoesNotExist, PlayerProgress.DoesNotExist) as e:
-            return JsonResponse({"error": "Player not found"}, status=404)
+        except TurnError as e:
+            return JsonResponse({"error": str(e)})
         except json.JSONDecodeError as e:
             return JsonResponse({"error": "Invalid JSON"}, status=400)
         except Exception as e:
@@ -260,54 +160,122 @@ def make_choice(request):
     return JsonResponse({"error": "Method not allowed"}, status=405)
 
 @login_required
-def get_stem_recommendation(request):
-    """Get STEM field recommendation for the player"""
+@player_required
+def play_turns(request):
+    """Play several choices in a row, each for the event that follows.
+
+    Takes ``{"choices": [index, ...]}`` and applies them in order in one
+    transaction, selecting each next event server-side. Responds with the
+    events played, the event now pending (null once the player has run out)
+    and the final player state. Nothing is applied if any choice is invalid.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "Method not allowed"}, status=405)
     try:
-        player = Player.objects.get(users=request.user)
-        recommendation = player.get_stem_recommendation()
+        choices = json.loads(request.body).get("choices")
+    except (json.JSONDecodeError, AttributeError):
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+    if not isinstance(choices, list) or not 0 < len(choices) <= MAX_BATCH_TURNS:
+        return JsonResponse({"error": f"choices must be a list of 1 to {MAX_BATCH_TURNS} indices"}, status=400)
+    
+    player = request.player
+    progress = request.progress
+    
+    # Load the catalog and completions once for the whole batch
+    catalog = get_catalog()
+    counts = dict(completion_counts(player, progress))
+    turns = []
+    log = []
+    with transaction.atomic():
+        for turn, choice_index in enumerate(choices):
+            event = current_event(player, progress, catalog, counts)
+            try:
+                if event is None:
+                    raise TurnError("No events available for this stage.")
+                play_choice(player, progress, event, choice_index, counts, log)
+            except TurnError as e:
+                transaction.set_rollback(True)
+                return JsonResponse({"error": str(e), "turn": turn}, status=400)
+            turns.append(b'{"event": %s, "choice_index": %d}' % (catalog.payload(event), choice_index))
         
-        return JsonResponse({
-            "recommendation": recommendation,
-            "interests": {
-                "science": player.science_interest,
-                "technology": player.technology_interest,
-                "engineering": player.engineering_interest,
-                "math": player.math_interest
+        flush_log(log)
+        event = current_event(player, progress, catalog, counts)
+        cache.invalidate_player(player.id, progress.id)
+    
+    stem_recommendation = None
+    if player.age >= 18:
+        stem_recommendation = player.get_stem_recommendation()
+    
+    content = b''.join([
+        b'{"success": true, "turns": [', b', '.join(turns), b']',
+        b', "event": ', catalog.payload(event) if event else b'null',
+        b', "player": ', json.dumps(player.serialize()).encode(),
+        b', "stem_recommendation": ', json.dumps(stem_recommendation).encode(),
+        b'}',
+    ])
+    return HttpResponse(content, content_type="application/json")
+
+@login_required
+@player_required
+def get_stem_recommendation(request):
+    """Get STEM field recommendation for the player"""
+    player = request.player
+    
+    def build_response():
+        key = cache.recommendation_key(player.id)
+        data = cache.get_versioned(key, player.state_version)
+        if data is None:
+            data = {
+                "recommendation": player.get_stem_recommendation(),
+                "interests": {
+                    "science": player.science_interest,
+                    "technology": player.technology_interest,
+                    "engineering": player.engineering_interest,
+                    "math": player.math_interest
+                }
             }
-        })
-    except Player.DoesNotExist:
-        return JsonResponse({"error": "Player not found"}, status=404)
+            cache.set_versioned(key, player.state_version, data, cache.RECOMMENDATION_TIMEOUT)
+        return JsonResponse(data)
+    
+    return state_response(request, player_etag(player), build_response)
 
 @login_required
+@player_required
 def reset_game(request):
     """Reset player progress and start over"""
-    try:
-        player = Player.objects.get(users=request.user)
-        progress = PlayerProgress.objects.get(player=player)
-        
-        # Reset player stats
-        player.age = 0
-        player.health = 100
-        player.intelligence = 50
-        player.creativity = 50
-        player.logic = 50
-        player.social_skills = 50
-        player.current_stage = "infant"
-        player.is_alive = True
-        player.science_interest = 0
-        player.technology_interest = 0
-        player.engineering_interest = 0
-        player.math_interest = 0
-        player.save()
-        
-        # Reset progress
-        progress.current_event = None
-        progress.completed_events.clear()
-        progress.save()
-        
-        return JsonResponse({"success": True})
-    except (Player.DoesNotExist, PlayerProgress.DoesNotExist):
-        return JsonResponse({"error": "Player not found"}, status=404)
+    player = request.player
+    progress = request.progress
+    
+    # Reset player stats
+    player.age_months = 0
+    player.health = 100
+    player.intelligence = 50
+    player.creativity = 50
+    player.logic = 50
+    player.social_skills = 50
+    player.current_stage = stage_for_age(player.age)
+    player.is_alive = True
+    player.science_interest = 0
+    player.technology_interest = 0
+    player.engineering_interest = 0
+    player.math_interest = 0
+    player.state_version = F('state_version') + 1
+    player.save(update_fields=[
+        'age_months', 'health', 'intelligence', 'creativity', 'logic', 'social_skills', 'current_stage',
+        'is_alive', 'science_interest', 'technology_interest', 'engineering_interest', 'math_interest',
+        'state_version',
+    ])
+    # Load the bumped version in place of the F expression
+    player.refresh_from_db(fields=['state_version'])
+    log_reset(player)
+    
+    # Reset progress
+    progress.current_event = None
+    progress.completed_events.clear()
+    progress.save()
+    cache.invalidate_player(player.id, progress.id)
+    
+    return JsonResponse({"success": True})
 
 def login_view(request):
     if request.method == "POST":
@@ -358,6 +326,49 @@ def register(request):
         return render(request, "stemlife/register.html")
 
 # Data
+@login_required
+def get_analytics(request):
+    """Outcomes across all players, as last materialized by refresh_analytics"""
+    if not request.user.is_staff:
+        return JsonResponse({"error": "Staff only"}, status=403)
+    return JsonResponse(analytics.summary())
+
+def questions_stamp(request):
+    # Read once per request, by the conditional checks and the view alike
+    if not hasattr(request, 'questions_stamp'):
+        request.questions_stamp = cache.questions_stamp()
+    return request.questions_stamp
+
+def questions_etag(request):
+    # Changes with the question bank and with the parameters
+    return cache.questions_key(questions_stamp(request).version, questions.cache_query(request.GET))
+
+def questions_last_modified(request):
+    return questions_stamp(request).changed_at
+
+@condition(etag_func=questions_etag, last_modified_func=questions_last_modified)
 def get_questions(request):
-    questions = Questions.objects.filter().all()
-    return JsonResponse([question.serialize() for question in questions], safe=False) 
+    """List the question bank, page through it, or stream it as NDJSON"""
+    params = request.GET
+    try:
+        if params.get('format') == 'ndjson':
+            rows = questions.export(params)
+            lines = (json.dumps(row, cls=DjangoJSONEncoder) + '\n' for row in rows)
+            return StreamingHttpResponse(lines, content_type='application/x-ndjson')
+        
+        key = cache.questions_key(questions_stamp(request).version, questions.cache_query(params))
+        data = django_cache.get(key)
+        if data is None:
+            if questions.is_paged(params):
+                rows, next_query = questions.page(params)
+                data = {
+                    "questions": rows,
+                    "next": f"{request.path}?{next_query}" if next_query else None,
+                }
+            else:
+                # Without paging parameters, the bare list clients expect
+                data = questions.listing(params)
+            django_cache.set(key, data, cache.QUESTIONS_TIMEOUT)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    return JsonResponse(data, safe=False)